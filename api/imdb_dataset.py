@@ -0,0 +1,329 @@
+import gzip
+import os
+import re
+import threading
+import unicodedata
+from typing import Iterator, Optional, TextIO
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+# Offline title database built from the IMDb dataset dumps
+# (https://datasets.imdbws.com/title.basics.tsv.gz and title.ratings.tsv.gz)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DB_PATH = os.path.join(BASE_DIR, "data", "imdb.db")
+
+MOVIE_TYPES = {"movie", "tvMovie"}  # title.basics rows we keep
+CHUNK_SIZE = 10_000  # rows per executemany call during import
+FUZZY_CANDIDATES_PER_KEY = 200  # most-voted titles fetched per query key for fuzzy scoring
+FUZZY_CUTOFF = 85  # minimum RapidFuzz token_sort_ratio for a fuzzy match (one swapped letter in "inceptoin")
+AFFIX_LENGTH = 3  # letters in the prefix/suffix keys that let misspelled words find candidates
+
+# Words too common to find candidate titles by
+STOPWORDS = {"a", "an", "the", "of", "and", "in", "on", "to"}
+
+_LEADING_ARTICLE = re.compile(r"^(the|a|an) ")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a title for lookups: lowercase, no accents or punctuation,
+    '&' spelled out and a leading article removed.
+
+    Args:
+        title (str): Raw title.
+
+    Returns:
+        str: Normalized title, e.g. "The Lord of the Rings: The Two Towers" -> "lord of the rings the two towers".
+    """
+    decomposed = unicodedata.normalize("NFKD", title.casefold().replace("&", " and "))
+    ascii_title = "".join(c for c in decomposed if not unicodedata.combining(c))
+    words = _NON_ALNUM.sub(" ", ascii_title).strip()
+    return _LEADING_ARTICLE.sub("", words)
+
+
+def title_keys(normalized: str) -> set[str]:
+    """
+    Keys used to find fuzzy-match candidates for a normalized title: its
+    words, plus "pre*" and "*fix" keys for longer words, so a word with a
+    typo at one end still shares a key with the correct spelling.
+    """
+    keys = set()
+    for word in normalized.split():
+        if word in STOPWORDS:
+            continue
+        keys.add(word)
+        if len(word) > AFFIX_LENGTH:
+            keys.add(word[:AFFIX_LENGTH] + "*")
+            keys.add("*" + word[-AFFIX_LENGTH:])
+    return keys
+
+
+def is_available(db_path: str = DATASET_DB_PATH) -> bool:
+    """Check whether an offline title database has been imported."""
+    return os.path.exists(db_path)
+
+
+def get_engine(db_path: str = DATASET_DB_PATH) -> Engine:
+    """
+    Get the (cached) engine for an offline title database, creating its tables if needed.
+
+    Args:
+        db_path (str): Path of the SQLite file.
+
+    Returns:
+        Engine: SQLAlchemy engine.
+    """
+    engine = _engines.get(db_path)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(db_path)
+            if engine is None:
+                engine = create_engine(f"sqlite:///{db_path}", echo=False)
+                with engine.begin() as connection:
+                    connection.execute(text("""
+                        CREATE TABLE IF NOT EXISTS titles (
+                            tconst TEXT PRIMARY KEY,
+                            title TEXT NOT NULL,
+                            normalized_title TEXT NOT NULL,
+                            year INTEGER,
+                            rating REAL,
+                            votes INTEGER NOT NULL DEFAULT 0
+                        ) WITHOUT ROWID;
+                    """))
+                    # Key -> titles, clustered by votes so the most popular come first
+                    connection.execute(text("""
+                        CREATE TABLE IF NOT EXISTS title_keys (
+                            key TEXT NOT NULL,
+                            votes INTEGER NOT NULL,
+                            tconst TEXT NOT NULL,
+                            PRIMARY KEY (key, votes, tconst)
+                        ) WITHOUT ROWID;
+                    """))
+                    _create_indexes(connection)
+                _engines[db_path] = engine
+    return engine
+
+
+def _create_indexes(connection) -> None:
+    """Create the lookup indexes (dropped during bulk import)."""
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_titles_title ON titles (title, votes)"
+    ))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_titles_normalized ON titles (normalized_title, votes)"
+    ))
+
+
+def _open_dump(path: str) -> TextIO:
+    """Open a (possibly gzip-compressed) TSV dump for streaming."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="\n")
+    return open(path, "r", encoding="utf-8", newline="\n")
+
+
+def _read_tsv(path: str) -> Iterator[list[Optional[str]]]:
+    """Yield the rows of an IMDb TSV dump one at a time, mapping '\\N' to None."""
+    with _open_dump(path) as file:
+        next(file, None)  # header
+        for line in file:
+            yield [None if field == "\\N" else field for field in line.rstrip("\n").split("\t")]
+
+
+def _chunks(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    """Group an iterator into lists of at most size items."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _basics_rows(path: str) -> Iterator[tuple]:
+    """Yield (tconst, title, normalized_title, year) for every movie in title.basics."""
+    for tconst, title_type, primary_title, _, _, start_year, *_ in _read_tsv(path):
+        if title_type in MOVIE_TYPES and primary_title:
+            year = int(start_year) if start_year and start_year.isdigit() else None
+            yield tconst, primary_title, normalize_title(primary_title), year
+
+
+def _ratings_rows(path: str) -> Iterator[tuple]:
+    """Yield (rating, votes, tconst) for every row in title.ratings."""
+    for tconst, average_rating, num_votes in _read_tsv(path):
+        yield float(average_rating), int(num_votes), tconst
+
+
+def import_dataset(basics_path: str, ratings_path: Optional[str] = None,
+                   db_path: str = DATASET_DB_PATH, chunk_size: int = CHUNK_SIZE) -> dict[str, int]:
+    """
+    Stream-import IMDb dataset dumps into the offline title database,
+    replacing any earlier import.
+
+    The dumps are read line by line (gzip is decompressed on the fly), so
+    memory use stays flat regardless of file size. Rows are written with
+    chunked executemany calls inside one transaction, and the indexes are
+    rebuilt once at the end instead of being maintained per row.
+
+    Args:
+        basics_path (str): Path to title.basics.tsv(.gz).
+        ratings_path (str | None): Path to title.ratings.tsv(.gz), if available.
+        db_path (str): Path of the SQLite file to fill.
+        chunk_size (int): Rows per executemany call.
+
+    Returns:
+        dict: Number of imported titles and applied ratings.
+    """
+    engine = get_engine(db_path)
+    counts = {"titles": 0, "ratings": 0}
+
+    with engine.connect() as connection:
+        # Durability is pointless for a rebuildable cache; trade it for speed
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        connection.exec_driver_sql("PRAGMA journal_mode = MEMORY")
+        connection.commit()
+
+        connection.exec_driver_sql("DROP INDEX IF EXISTS idx_titles_title")
+        connection.exec_driver_sql("DROP INDEX IF EXISTS idx_titles_normalized")
+        connection.exec_driver_sql("DELETE FROM titles")
+        connection.exec_driver_sql("DELETE FROM title_keys")
+        # Keys are staged without votes; title_keys is filled once ratings are known
+        connection.exec_driver_sql("CREATE TEMP TABLE IF NOT EXISTS staged_keys (key TEXT, tconst TEXT)")
+        connection.exec_driver_sql("DELETE FROM staged_keys")
+
+        for chunk in _chunks(_basics_rows(basics_path), chunk_size):
+            connection.exec_driver_sql("""
+                INSERT OR REPLACE INTO titles (tconst, title, normalized_title, year)
+                VALUES (?, ?, ?, ?)
+            """, chunk)
+            connection.exec_driver_sql(
+                "INSERT INTO staged_keys (key, tconst) VALUES (?, ?)",
+                [(key, tconst) for tconst, _, normalized, _ in chunk for key in title_keys(normalized)]
+            )
+            counts["titles"] += len(chunk)
+
+        if ratings_path:
+            for chunk in _chunks(_ratings_rows(ratings_path), chunk_size):
+                result = connection.exec_driver_sql(
+                    "UPDATE titles SET rating = ?, votes = ? WHERE tconst = ?", chunk
+                )
+                counts["ratings"] += max(result.rowcount, 0)
+
+        connection.exec_driver_sql("""
+            INSERT OR IGNORE INTO title_keys (key, votes, tconst)
+            SELECT s.key, t.votes, s.tconst
+            FROM staged_keys s JOIN titles t ON t.tconst = s.tconst
+        """)
+        connection.exec_driver_sql("DROP TABLE staged_keys")
+
+        _create_indexes(connection)
+        connection.commit()
+        connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+
+    return counts
+
+
+def _to_movie_data(row) -> dict:
+    """Convert a titles row to the dict format returned by fetch_movie_data."""
+    return {
+        "title": row.title,
+        "year": row.year or 0,
+        "rating": row.rating or 0.0,
+        "poster_url": None,
+        "imdb_id": row.tconst
+    }
+
+
+def find_titles(title: str, limit: int = 5, db_path: str = DATASET_DB_PATH,
+                fuzzy: bool = True) -> list[tuple[dict, float]]:
+    """
+    Find the movies best matching a title, without any network access.
+
+    Exact and normalized matches (case, punctuation, accents, leading
+    article) score 100. If there are fewer than limit of those and fuzzy is
+    set, the most-voted titles sharing a key with the query (a word, or a
+    word's first or last letters, see title_keys) are scored with
+    token_sort_ratio and those reaching FUZZY_CUTOFF are added. Ties are
+    broken by number of IMDb votes.
+
+    Args:
+        title (str): Title as entered by the user.
+        limit (int): Maximum number of results.
+        db_path (str): Path of the offline title database.
+        fuzzy (bool): Also return fuzzy matches.
+
+    Returns:
+        list: (movie data in the fetch_movie_data format, score) tuples, best first.
+    """
+    normalized = normalize_title(title)
+    if not normalized:
+        return []
+
+    with get_engine(db_path).connect() as connection:
+        rows = connection.execute(text("""
+            SELECT tconst, title, year, rating, votes FROM titles
+            WHERE title = :title
+            ORDER BY votes DESC LIMIT :limit
+        """), {"title": title.strip(), "limit": limit}).fetchall()
+        rows += connection.execute(text("""
+            SELECT tconst, title, year, rating, votes FROM titles
+            WHERE normalized_title = :normalized
+            ORDER BY votes DESC LIMIT :limit
+        """), {"normalized": normalized, "limit": limit}).fetchall()
+
+        matches: dict[str, tuple] = {}
+        for row in rows:
+            matches.setdefault(row.tconst, (row, 100.0))
+
+        if fuzzy and len(matches) < limit:
+            candidates: dict[str, tuple] = {}
+            for key in title_keys(normalized):
+                for row in connection.execute(text("""
+                    SELECT t.tconst, t.title, t.normalized_title, t.year, t.rating, t.votes
+                    FROM title_keys k JOIN titles t ON t.tconst = k.tconst
+                    WHERE k.key = :key
+                    ORDER BY k.votes DESC LIMIT :limit
+                """), {"key": key, "limit": FUZZY_CANDIDATES_PER_KEY}):
+                    candidates.setdefault(row.tconst, row)
+            _add_fuzzy_matches(normalized, list(candidates.values()), matches, limit)
+
+    ranked = sorted(matches.values(), key=lambda match: (-match[1], -match[0].votes))
+    return [(_to_movie_data(row), score) for row, score in ranked[:limit]]
+
+
+def _add_fuzzy_matches(normalized: str, candidates: list, matches: dict, limit: int) -> None:
+    """Score candidates against the query and add the confident ones to matches."""
+    if not candidates:
+        return
+
+    from rapidfuzz import fuzz, process
+
+    # token_sort_ratio compares whole titles, so "matrix" does not match
+    # "matrix reloaded" the way partial scorers like WRatio would
+    for _, score, index in process.extract(
+        normalized, [c.normalized_title for c in candidates],
+        scorer=fuzz.token_sort_ratio, score_cutoff=FUZZY_CUTOFF, limit=limit
+    ):
+        matches.setdefault(candidates[index].tconst, (candidates[index], score))
+
+
+def lookup_title(title: str, db_path: str = DATASET_DB_PATH, fuzzy: bool = True) -> Optional[dict]:
+    """
+    Resolve a title to the single best offline match (see find_titles).
+
+    Args:
+        title (str): Title as entered by the user.
+        db_path (str): Path of the offline title database.
+        fuzzy (bool): Accept a fuzzy match when there is no exact or normalized one.
+
+    Returns:
+        dict | None: Movie data in the fetch_movie_data format, or None if nothing matched confidently.
+    """
+    matches = find_titles(title, 1, db_path, fuzzy)
+    return matches[0][0] if matches else None
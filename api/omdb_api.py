@@ -1,17 +1,122 @@
-import requests
+from functools import lru_cache
 from typing import Optional
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+OMDB_URL = "http://www.omdbapi.com/"
+SEARCH_NOT_FOUND = "Movie not found!"  # OMDb's error text for a search without results
 
-OMDB_API_KEY = os.getenv("OMDB_API_KEY")
-TEST_MODE = os.getenv("TEST_MODE", "False").lower() == "true"  # Toggle this to True for development fallback
+
+@lru_cache(maxsize=None)
+def _settings() -> tuple[Optional[str], bool]:
+    """
+    Load the .env file on first use and return the API settings.
+
+    Loading is deferred so that importing this module stays cheap for
+    commands that never talk to OMDb.
+
+    Returns:
+        tuple: (OMDb API key, whether TEST_MODE fallback is enabled).
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    api_key = os.getenv("OMDB_API_KEY")
+    test_mode = os.getenv("TEST_MODE", "False").lower() == "true"  # Toggle this to True for development fallback
+    return api_key, test_mode
+
+
+def is_test_mode() -> bool:
+    """Check whether TEST_MODE fallback data is enabled in the environment/.env."""
+    return _settings()[1]
+
+
+def _lookup_offline(title: str) -> Optional[dict]:
+    """
+    Resolve a title from the offline IMDb title database, if one has been imported.
+
+    Only exact and normalized matches are used: callers add or link the
+    result without asking, so a fuzzy guess must fall through to OMDb.
+
+    Args:
+        title (str): The movie title.
+
+    Returns:
+        dict | None: Movie data or None if there is no offline database or no match.
+    """
+    from api import imdb_dataset
+
+    if not imdb_dataset.is_available():
+        return None
+    return imdb_dataset.lookup_title(title, fuzzy=False)
+
+
+def _test_movie_data(title: str) -> dict:
+    """Dummy movie data returned in TEST_MODE."""
+    return {
+        "title": title,
+        "year": 2000,
+        "rating": 7.0,
+        "poster_url": "https://via.placeholder.com/150",
+        "imdb_id": "tt0111161"
+    }
+
+
+def _get(params: dict) -> Optional[dict]:
+    """
+    Send one query to the OMDb API.
+
+    Args:
+        params (dict): Query parameters besides the API key (URL-encoded by requests).
+
+    Returns:
+        dict | None: The decoded response (also when "Response" is "False"), or None if the request failed.
+    """
+    import requests
+
+    api_key, _ = _settings()
+    try:
+        response = requests.get(OMDB_URL, params={"apikey": api_key, **params}, timeout=5)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def _request(params: dict) -> Optional[dict]:
+    """
+    Send one query to the OMDb API.
+
+    Args:
+        params (dict): Query parameters besides the API key (URL-encoded by requests).
+
+    Returns:
+        dict | None: The decoded response, or None on errors and "Response": "False".
+    """
+    data = _get(params)
+    return data if data and data.get("Response") == "True" else None
+
+
+def _to_movie_data(data: dict) -> dict:
+    """Convert an OMDb title response to our movie data dict ("N/A" values become 0)."""
+    year = data.get("Year", "")[:4]
+    try:
+        rating = float(data.get("imdbRating", 0.0))
+    except ValueError:
+        rating = 0.0
+
+    return {
+        "title": data.get("Title"),
+        "year": int(year) if year.isdigit() else 0,
+        "rating": rating,
+        "poster_url": data.get("Poster"),
+        "imdb_id": data.get("imdbID")
+    }
 
 
 def fetch_movie_data(title: str) -> Optional[dict]:
     """
-    Fetch movie data from OMDb API or return fallback data in test mode.
+    Fetch movie data from the offline title database, the OMDb API,
+    or return fallback data in test mode.
 
     Args:
         title (str): The title of the movie to search for.
@@ -19,39 +124,54 @@ def fetch_movie_data(title: str) -> Optional[dict]:
     Returns:
         dict | None: A dictionary with movie details or None if not found or error occurs.
     """
-    if TEST_MODE:
-        return {
-            "title": title,
-            "year": 2000,
-            "rating": 7.0,
-            "poster_url": "https://via.placeholder.com/150",
-            "imdb_id": "tt0111161"
-        }
+    offline = _lookup_offline(title)
+    if offline:
+        return offline
 
-    url = f"http://www.omdbapi.com/?apikey={OMDB_API_KEY}&t={title}"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+    _, test_mode = _settings()
+    if test_mode:
+        return _test_movie_data(title)
 
-        if data.get("Response") != "True":
-            return None
+    data = _request({"t": title})
+    return _to_movie_data(data) if data else None
 
-        return {
-            "title": data.get("Title"),
-            "year": int(data.get("Year", 0)),
-            "rating": float(data.get("imdbRating", 0.0)),
-            "poster_url": data.get("Poster"),
-            "imdb_id": data.get("imdbID")
-        }
 
-    except (requests.RequestException, ValueError):
+def fetch_movie_by_id(imdb_id: str) -> Optional[dict]:
+    """
+    Fetch movie data for an IMDb ID from the OMDb API.
+
+    Args:
+        imdb_id (str): IMDb ID, e.g. "tt0111161".
+
+    Returns:
+        dict | None: A dictionary with movie details or None if not found or error occurs.
+    """
+    data = _request({"i": imdb_id})
+    return _to_movie_data(data) if data else None
+
+
+def search_titles(query: str) -> Optional[list[str]]:
+    """
+    Search OMDb for movies matching a query (the API's "s" search).
+
+    Args:
+        query (str): Search text.
+
+    Returns:
+        list | None: IMDb IDs of the matches in OMDb's order (at most 10), empty if
+        OMDb found nothing, None if the search failed (network, API key, rate limit).
+    """
+    data = _get({"s": query, "type": "movie"})
+    if data is None:
         return None
+    if data.get("Response") != "True":
+        return [] if data.get("Error") == SEARCH_NOT_FOUND else None
+    return [result["imdbID"] for result in data.get("Search", []) if result.get("imdbID")]
 
 
 def fetch_imdb_id(title: str) -> Optional[str]:
     """
-    Fetch the IMDb ID for a given movie title from the OMDb API.
+    Fetch the IMDb ID for a given movie title from the offline title database or the OMDb API.
 
     Args:
         title (str): The movie title.
@@ -59,11 +179,9 @@ def fetch_imdb_id(title: str) -> Optional[str]:
     Returns:
         str | None: IMDb ID string or None if not found.
     """
-    url = f"http://www.omdbapi.com/?apikey={OMDB_API_KEY}&t={title}"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("imdbID") if data.get("Response") == "True" else None
-    except requests.RequestException:
-        return None
+    offline = _lookup_offline(title)
+    if offline:
+        return offline["imdb_id"]
+
+    data = _request({"t": title})
+    return data.get("imdbID") if data else None
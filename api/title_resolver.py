@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from rapidfuzz import fuzz
+
+from api import imdb_dataset, omdb_api
+from api.imdb_dataset import normalize_title
+from storage import movie_storage_sql as storage
+
+MAX_CANDIDATES = 5  # movies offered to the user per query
+
+
+def _rank(query: str, candidates: list[dict], exact: Optional[dict]) -> list[dict]:
+    """Order candidates: OMDb's exact-title hit first, then by title similarity to the query."""
+    normalized = normalize_title(query)
+    unique: dict[str, dict] = {}
+    for candidate in candidates:
+        unique.setdefault(candidate["imdb_id"], candidate)
+
+    def sort_key(candidate: dict) -> tuple:
+        is_exact = exact is not None and candidate["imdb_id"] == exact["imdb_id"]
+        return not is_exact, -fuzz.WRatio(normalized, normalize_title(candidate["title"]))
+
+    return sorted(unique.values(), key=sort_key)[:MAX_CANDIDATES]
+
+
+def _resolve_online(query: str, offline: list[dict]) -> tuple[list[dict], bool]:
+    """
+    Query OMDb speculatively: the exact-title lookup and the search run at the
+    same time, and details for the top search hits are fetched in parallel as
+    soon as the search answers, so everything costs about one round trip
+    more than a single request instead of one per retyped title. Offline
+    candidates are ranked together with the online ones.
+
+    Returns a flag that is only True if the search answered and every
+    detail request succeeded, i.e. the list is worth caching.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CANDIDATES + 2) as pool:
+        exact_future = pool.submit(omdb_api.fetch_movie_data, query)
+        search_future = pool.submit(omdb_api.search_titles, query)
+
+        found = search_future.result()
+        detail_futures = [
+            pool.submit(omdb_api.fetch_movie_by_id, imdb_id)
+            for imdb_id in (found or [])[:MAX_CANDIDATES]
+        ]
+        exact = exact_future.result()
+        details = [future.result() for future in detail_futures]
+
+    complete = found is not None and all(details)
+    candidates = ([exact] if exact else []) + [d for d in details if d] + offline
+    return _rank(query, candidates, exact), complete
+
+
+def resolve_title(query: str) -> list[dict]:
+    """
+    Resolve a user-entered title to a ranked list of candidate movies.
+
+    Queries resolved before are answered from the local alias index without
+    any network access. Otherwise the offline IMDb title database is
+    searched: if it has the title itself (ignoring case and punctuation),
+    its ranked matches are returned without going online. Fuzzy offline
+    matches are merged with the OMDb results instead (see _resolve_online),
+    which are stored in the alias index for next time unless part of the
+    OMDb round trip failed.
+
+    Args:
+        query (str): Title as entered by the user.
+
+    Returns:
+        list: Movie data dicts (title, year, rating, poster_url, imdb_id), best match first; empty if nothing was found.
+    """
+    key = normalize_title(query)
+    if not key:
+        return []
+
+    cached = storage.get_title_aliases(key)
+    if cached:
+        return cached
+
+    matches = imdb_dataset.find_titles(query, MAX_CANDIDATES) if imdb_dataset.is_available() else []
+    offline = [movie for movie, _ in matches]
+    if matches and matches[0][1] == 100:
+        return offline
+
+    if omdb_api.is_test_mode():
+        return [omdb_api.fetch_movie_data(query)] + offline
+
+    candidates, complete = _resolve_online(query, offline)
+    if candidates and complete:
+        storage.save_title_aliases(key, candidates)
+    return candidates
+
+
+def remember_choice(query: str, candidates: list[dict], chosen: dict) -> None:
+    """
+    Move the candidate the user picked to the front of the query's alias list,
+    so the next lookup of the same query ranks it first.
+
+    Args:
+        query (str): Title as entered by the user.
+        candidates (list): Candidates returned by resolve_title.
+        chosen (dict): The candidate the user picked.
+    """
+    key = normalize_title(query)
+    if key and candidates and candidates[0] is not chosen and chosen.get("imdb_id"):
+        storage.save_title_aliases(key, [chosen] + [c for c in candidates if c is not chosen])
@@ -0,0 +1,208 @@
+import re
+from collections import defaultdict
+from typing import Sequence
+
+from rapidfuzz import fuzz, process
+
+from api.imdb_dataset import normalize_title
+from storage import movie_storage_sql as storage
+
+DEFAULT_THRESHOLD = 90  # minimum token_set_ratio for two titles to count as duplicates
+MIN_SORT_RATIO = 80  # minimum token_sort_ratio too, unless one title extends the other (see _extends)
+MAX_YEAR_GAP = 1  # release years may differ by this much (OMDb vs. festival year)
+ROW_CHUNK = 1000  # rows per cdist call, bounds the score matrix to ROW_CHUNK x block size
+PARALLEL_BLOCK_SIZE = 64  # smaller groups are scored on one thread, starting workers costs more
+
+# Words too common to group titles by
+STOPWORDS = {"a", "an", "the", "of", "and", "in", "on", "to", "part", "episode", "chapter"}
+
+# Roman numerals used for sequels ("i" is left out, it is usually the pronoun)
+ROMAN_NUMERALS = {"ii": 2, "iii": 3, "iv": 4, "v": 5, "vi": 6, "vii": 7, "viii": 8, "ix": 9, "x": 10}
+
+# Words that mark an instalment rather than a different title ("Star Wars Episode IV")
+SEQUEL_MARKERS = {"episode", "part", "chapter", "vol", "volume"}
+
+_SUBTITLE_SEPARATOR = re.compile(r":| - ")
+
+
+class UnionFind:
+    """Disjoint sets over the integers 0..size-1 (path halving, union by size)."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        """Return the representative of item's set."""
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        """Merge the sets containing a and b."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+
+def _block_keys(normalized: str, year: int) -> set[str]:
+    """
+    Candidate groups for a title.
+
+    Every title joins the group of its first significant word. Titles with a
+    known year also join one group per (word, year) for each significant word,
+    for both the year and the following one, so matches one year apart share
+    a group. Titles without any common word cannot reach the threshold anyway.
+    """
+    words = [word for word in normalized.split() if word not in STOPWORDS]
+    if not words:
+        return {f"title:{normalized}"}
+
+    keys = {f"first:{words[0]}"}
+    if year:
+        keys.update(f"{word}:{y}" for word in words for y in (year, year + MAX_YEAR_GAP))
+    return keys
+
+
+def _years_compatible(year_a: int, year_b: int) -> bool:
+    """Sequels and remakes differ in year; unknown years (0) match anything."""
+    return not year_a or not year_b or abs(year_a - year_b) <= MAX_YEAR_GAP
+
+
+def _sequel_numbers(normalized: str) -> set[int]:
+    """Numbers in a title, with Roman numerals converted ("part ii" and "part 2" agree)."""
+    numbers = set()
+    for word in normalized.split():
+        if word.isdigit():
+            numbers.add(int(word))
+        elif word in ROMAN_NUMERALS:
+            numbers.add(ROMAN_NUMERALS[word])
+    return numbers
+
+
+def _extends(short: str, long_title: str, long_normalized: str) -> bool:
+    """
+    Check whether a title is a shorter form of another: the longer one only
+    adds a subtitle after ':' or ' - ', or instalment markers and numbers.
+    """
+    if normalize_title(_SUBTITLE_SEPARATOR.split(long_title, 1)[0]) == short:
+        return True
+    if not long_normalized.startswith(short + " "):
+        return False
+    extra = long_normalized[len(short) + 1:].split()
+    return all(word in SEQUEL_MARKERS or word.isdigit() or word in ROMAN_NUMERALS for word in extra)
+
+
+def _titles_match(movie_a, movie_b, title_a: str, title_b: str) -> bool:
+    """
+    Second check for a pair that passed token_set_ratio.
+
+    token_set_ratio scores a title contained in another at 100 ("Up" vs.
+    "Up in the Air"), so the whole titles must also be similar, unless one
+    title extends the other ("Star Wars" vs. "Star Wars: Episode IV") and
+    both have the same year. Titles that both carry a number and differ in
+    it ("Vol. 1" vs. "Vol. 2") are sequels.
+    """
+    numbers_a, numbers_b = _sequel_numbers(title_a), _sequel_numbers(title_b)
+    if numbers_a and numbers_b and numbers_a != numbers_b:
+        return False
+    if fuzz.token_sort_ratio(title_a, title_b) >= MIN_SORT_RATIO:
+        return True
+    return movie_a.year == movie_b.year and (
+        _extends(title_a, movie_b.title, title_b) or _extends(title_b, movie_a.title, title_a)
+    )
+
+
+def find_duplicate_clusters(movies: Sequence, threshold: int = DEFAULT_THRESHOLD) -> list[list]:
+    """
+    Find groups of movies whose titles are near-duplicates.
+
+    Instead of comparing all pairs, movies are grouped by normalized words
+    and release year (see _block_keys). Titles are only scored against the
+    others in the same group, with RapidFuzz's cdist (on all cores for large
+    groups); pairs above the threshold must also pass _titles_match.
+    Matching pairs are joined with union-find, so "A ~ B" and "B ~ C" end
+    up in one cluster.
+
+    Args:
+        movies (Sequence): Movie rows with title and year attributes.
+        threshold (int): Minimum token_set_ratio score (0-100).
+
+    Returns:
+        list: Clusters (lists of movie rows) with at least two movies each.
+    """
+    normalized = [normalize_title(movie.title) for movie in movies]
+
+    blocks: dict[str, list[int]] = defaultdict(list)
+    for index, movie in enumerate(movies):
+        for key in _block_keys(normalized[index], movie.year):
+            blocks[key].append(index)
+
+    union_find = UnionFind(len(movies))
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        titles = [normalized[i] for i in members]
+        workers = -1 if len(members) >= PARALLEL_BLOCK_SIZE else 1
+        for start in range(0, len(members), ROW_CHUNK):
+            scores = process.cdist(
+                titles[start:start + ROW_CHUNK], titles,
+                scorer=fuzz.token_set_ratio, score_cutoff=threshold, workers=workers
+            )
+            rows, cols = scores.nonzero()
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                a, b = members[start + row], members[col]
+                if (a < b and _years_compatible(movies[a].year, movies[b].year)
+                        and _titles_match(movies[a], movies[b], normalized[a], normalized[b])):
+                    union_find.union(a, b)
+
+    clusters: dict[int, list] = defaultdict(list)
+    for index, movie in enumerate(movies):
+        clusters[union_find.find(index)].append(movie)
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
+
+
+def suggest_merge(cluster: list) -> tuple:
+    """
+    Pick which movie of a cluster to keep.
+
+    Prefers the entry with a poster, then one with a note, then the longest
+    (most specific) title.
+
+    Args:
+        cluster (list): Movie rows considered duplicates.
+
+    Returns:
+        tuple: (movie to keep, list of movies to merge into it).
+    """
+    keep = max(cluster, key=lambda m: (bool(m.poster_url), bool(m.note), len(m.title)))
+    return keep, [movie for movie in cluster if movie is not keep]
+
+
+def apply_merges(merges: list[tuple], user_id: int) -> list[storage.StatementResult]:
+    """
+    Apply accepted merges in a single transaction.
+
+    The merged-away movies are deleted; their notes are appended to the
+    kept movie's note so nothing the user wrote is lost.
+
+    Args:
+        merges (list): (keep, duplicates) tuples as returned by suggest_merge.
+        user_id (int): User ID.
+
+    Returns:
+        list: StatementResult records of the batch.
+    """
+    with storage.batch() as tx:
+        for keep, duplicates in merges:
+            if any(m.note for m in duplicates):
+                notes = [m.note for m in [keep, *duplicates] if m.note]
+                tx.update_note(keep.title, " | ".join(notes), user_id)
+            for duplicate in duplicates:
+                tx.delete_movie(duplicate.title, user_id)
+    return tx.results
@@ -1,34 +1,63 @@
+from html import escape
 from pathlib import Path
 from typing import Optional
+from urllib.parse import quote_plus
 
 from api.omdb_api import fetch_imdb_id
 from storage.movie_storage_sql import get_user_movies
 
 
-def generate_movie_card(movie) -> str:
+def generate_movie_card(movie, resolve_imdb: bool = True) -> str:
     """
     Generate an HTML snippet for a single movie card.
 
     Args:
         movie: A row object with attributes: title, year, poster_url.
+        resolve_imdb (bool): Look up the IMDb link via the OMDb API. When False,
+            the card links to an IMDb search instead (no network access).
 
     Returns:
         str: HTML representation of the movie card.
     """
-    imdb_id: Optional[str] = fetch_imdb_id(movie.title)
-    imdb_link: str = f"https://www.imdb.com/title/{imdb_id}" if imdb_id else "#"
+    if resolve_imdb:
+        imdb_id: Optional[str] = fetch_imdb_id(movie.title)
+        imdb_link: str = f"https://www.imdb.com/title/{imdb_id}" if imdb_id else "#"
+    else:
+        imdb_link = f"https://www.imdb.com/find/?q={quote_plus(movie.title)}"
 
     return f"""
     <div class="movie-card">
         <a href="{imdb_link}" target="_blank">
-            <img src="{movie.poster_url}" alt="Poster of {movie.title}">
+            <img src="{escape(movie.poster_url or '')}" alt="Poster of {escape(movie.title)}">
         </a>
-        <div class="movie-title">{movie.title}</div>
+        <div class="movie-title">{escape(movie.title)}</div>
         <div class="movie-year">{movie.year}</div>
     </div>
     """
 
 
+def render_html(movies: list,
+                template_path: str = "static/index_template.html",
+                resolve_imdb: bool = True,
+                footer_html: str = "") -> str:
+    """
+    Render a list of movies into the HTML template.
+
+    Args:
+        movies (list): Movie rows to render.
+        template_path (str): Path to the HTML template.
+        resolve_imdb (bool): Passed on to generate_movie_card.
+        footer_html (str): Extra HTML appended after the cards (e.g. pagination links).
+
+    Returns:
+        str: The complete HTML page.
+    """
+    cards_html: str = "\n".join(generate_movie_card(m, resolve_imdb) for m in movies)
+
+    template: str = Path(template_path).read_text(encoding="utf-8")
+    return template.replace("{{MOVIE_CARDS}}", cards_html + footer_html)
+
+
 def generate_html(user_id: int,
                   template_path: str = "static/index_template.html",
                   output_path: str = "movies_output.html") -> None:
@@ -45,10 +74,7 @@ def generate_html(user_id: int,
         print("❌ No movies to export.")
         return
 
-    cards_html: str = "\n".join(generate_movie_card(m) for m in movies)
-
-    template: str = Path(template_path).read_text(encoding="utf-8")
-    html_output: str = template.replace("{{MOVIE_CARDS}}", cards_html)
+    html_output: str = render_html(movies, template_path)
 
     Path(output_path).write_text(html_output, encoding="utf-8")
     print(f"✅ HTML export completed: {output_path}")
@@ -1,8 +1,8 @@
+import argparse
 import random
 import sys
 from typing import Optional
 from rapidfuzz import process
-from api.omdb_api import fetch_movie_data
 from html_generator import generate_html
 from storage import movie_storage_sql as storage
 
@@ -19,9 +19,10 @@ def choose_user() -> int:
 
     if not users:
         print("No users found. Let's create one!")
-        new_name = input("Enter your name: ").strip()
-        storage.add_user(new_name)
-        return storage.get_user_id(new_name)
+        while True:
+            new_name = input("Enter your name: ").strip()
+            if new_name and storage.add_user(new_name):
+                return storage.get_user_id(new_name)
 
     print("\nSelect a user:")
     for idx, user in enumerate(users, start=1):
@@ -36,8 +37,9 @@ def choose_user() -> int:
                 return users[choice - 1].id
             elif choice == len(users) + 1:
                 new_name = input("Enter new user name: ").strip()
-                storage.add_user(new_name)
-                return storage.get_user_id(new_name)
+                if new_name and storage.add_user(new_name):
+                    return storage.get_user_id(new_name)
+                continue
         print("❌ Invalid input, please try again.")
 
 def command_list_movies() -> None:
@@ -53,26 +55,57 @@ def command_list_movies() -> None:
 
     return_to_menu()
 
+def choose_candidate(candidates: list[dict], query: str) -> Optional[dict]:
+    """
+    Let the user pick one of the matching movies; None means cancelled.
+
+    Only a single candidate whose title is the entered one is taken without
+    asking; a lone fuzzy match still has to be confirmed.
+    """
+    from api.imdb_dataset import normalize_title
+
+    if len(candidates) == 1 and normalize_title(candidates[0]["title"]) == normalize_title(query):
+        return candidates[0]
+
+    print("\n🎞️ Matching movies:")
+    for idx, candidate in enumerate(candidates, start=1):
+        print(f"{idx}. {candidate['title']} ({candidate['year']}) - ⭐ {candidate['rating']}")
+    print("0. Cancel")
+
+    while True:
+        choice = input("Enter your choice (Enter for 1): ").strip() or "1"
+        if choice.isdigit() and 0 <= int(choice) <= len(candidates):
+            return candidates[int(choice) - 1] if choice != "0" else None
+        print("❌ Invalid input, please try again.")
+
 def command_add_movie() -> None:
     """Add a new movie to the user's collection using the OMDb API."""
+    from api.title_resolver import remember_choice, resolve_title
+
     title_input = input("🎬 Enter movie title: ").strip()
-    movie_data = fetch_movie_data(title_input)
+    candidates = resolve_title(title_input)
 
-    if not movie_data:
+    if not candidates:
         print("❌ Could not fetch movie data from OMDb API.")
         return
 
-    try:
-        storage.add_movie(
-            title=movie_data["title"],
-            year=movie_data["year"],
-            rating=movie_data["rating"],
-            poster_url=movie_data["poster_url"],
-            user_id=current_user_id
-        )
+    movie_data = choose_candidate(candidates, title_input)
+    if not movie_data:
+        print("❌ Adding cancelled.")
+        return_to_menu()
+    remember_choice(title_input, candidates, movie_data)
+
+    added = storage.add_movie(
+        title=movie_data["title"],
+        year=movie_data["year"],
+        rating=movie_data["rating"],
+        poster_url=movie_data["poster_url"],
+        user_id=current_user_id
+    )
+    if added:
         print(f"✅ Movie '{movie_data['title']}' added successfully.")
-    except Exception as e:
-        print(f"❌ Error adding movie: {e}")
+    else:
+        print(f"❌ Movie '{movie_data['title']}' was not added.")
 
     return_to_menu()
 
@@ -140,7 +173,8 @@ def command_update_movie() -> None:
         year=year,
         rating=rating,
         poster_url=poster_url,
-        user_id=current_user_id
+        user_id=current_user_id,
+        expected_version=current_data['version']
     )
 
     if success:
@@ -242,22 +276,61 @@ def command_sort_movies_by_year() -> None:
 
     return_to_menu()
 
+def parse_range(text: str, cast: type) -> tuple:
+    """Parse 'a-b', 'a-', '-b' or 'a' into a (min, max) tuple; empty parts become None."""
+    if not text:
+        return None, None
+    low, sep, high = text.partition("-")
+    if not sep:
+        return cast(low), cast(low)
+    return (cast(low) if low.strip() else None), (cast(high) if high.strip() else None)
+
 def command_filter_movies() -> None:
-    """Filter and display movies that meet a minimum rating threshold."""
+    """Filter movies by any combination of year, rating, title and note, with custom sorting."""
+    print("🔍 Filter movies (leave any field empty to skip it)")
     try:
-        min_rating = float(input("🔍 Enter minimum rating (0.0 - 10.0): ").strip())
+        year_min, year_max = parse_range(input("📅 Year or range (e.g. 1990-1999): ").strip(), int)
+        rating_min, rating_max = parse_range(input("⭐ Rating or range (e.g. 7-8): ").strip(), float)
     except ValueError:
-        print("❌ Invalid rating input.")
+        print("❌ Invalid range input.")
+        return_to_menu()
+
+    title_contains = input("🎬 Title contains: ").strip() or None
+    title_match = input("🔎 Title words (full-text, matches word beginnings): ").strip() or None
+    note_input = input("📝 Only movies with a note? (y/n): ").strip().lower()
+    has_note = {"y": True, "n": False}.get(note_input)
+
+    sort_input = input(f"↕️ Sort by ({', '.join(storage.SORT_COLUMNS)}; prefix '-' for descending, "
+                       f"comma-separated): ").strip()
+    sort = tuple(key.strip() for key in sort_input.split(",") if key.strip()) or ("title",)
+    limit_input = input("🔢 Maximum number of results: ").strip()
+
+    try:
+        movies = storage.query_movies(
+            current_user_id,
+            year_min=year_min,
+            year_max=year_max,
+            rating_min=rating_min,
+            rating_max=rating_max,
+            title_contains=title_contains,
+            title_match=title_match,
+            has_note=has_note,
+            sort=sort,
+            limit=int(limit_input) if limit_input else None
+        )
+    except ValueError as e:
+        print(f"❌ Invalid input: {e}")
         return_to_menu()
 
-    movies = storage.filter_movies_by_rating(current_user_id, min_rating)
     if not movies:
-        print("❌ No movies found with that rating or higher.")
+        print("❌ No movies match these filters.")
         return_to_menu()
 
-    print(f"\n🎯 Movies with rating >= {min_rating}:\n")
+    print(f"\n🎯 {len(movies)} matching movie(s):\n")
     for movie in movies:
         print(f"🎬 {movie.title} ({movie.year}) - ⭐ {movie.rating}")
+        if movie.note:
+            print(f"📝 {movie.note}")
         print(f"🖼️ {movie.poster_url}\n")
 
     return_to_menu()
@@ -272,6 +345,39 @@ def command_export_to_html() -> None:
 
     return_to_menu()
 
+def command_find_duplicates() -> None:
+    """Find near-duplicate titles and merge the ones the user accepts."""
+    from dedup import apply_merges, find_duplicate_clusters, suggest_merge
+
+    movies = storage.get_user_movies(current_user_id)
+    clusters = find_duplicate_clusters(movies)
+    if not clusters:
+        print("✅ No duplicate movies found.")
+        return_to_menu()
+
+    print(f"\n🧬 Found {len(clusters)} group(s) of possible duplicates:\n")
+    accepted = []
+    for keep, duplicates in map(suggest_merge, clusters):
+        print(f"🎬 Keep: {keep.title} ({keep.year}) - ⭐ {keep.rating}")
+        for movie in duplicates:
+            print(f"   🗑️ Merge: {movie.title} ({movie.year}) - ⭐ {movie.rating}")
+        if input("❓ Merge these? (y/n): ").strip().lower() == "y":
+            accepted.append((keep, duplicates))
+        print()
+
+    if not accepted:
+        print("❌ No merges applied.")
+        return_to_menu()
+
+    try:
+        apply_merges(accepted, current_user_id)
+        removed = sum(len(duplicates) for _, duplicates in accepted)
+        print(f"✅ Merged {len(accepted)} group(s), removed {removed} duplicate(s).")
+    except Exception as e:
+        print(f"❌ Merge failed, nothing was changed: {e}")
+
+    return_to_menu()
+
 def present_menu() -> None:
     """Display the main menu and handle user selection."""
     print("\033[33mMenu:")
@@ -287,10 +393,11 @@ def present_menu() -> None:
     print("9. Movies sorted by year")
     print("10. Filter movies")
     print("11. Export movies as HTML")
+    print("12. Find duplicate movies")
     print("\033[0m")
 
     try:
-        choice = int(input("\033[34mEnter choice (0-11): \033[0m"))
+        choice = int(input("\033[34mEnter choice (0-12): \033[0m"))
     except ValueError:
         print("❌ Invalid input. Please enter a number.")
         return present_menu()
@@ -307,7 +414,8 @@ def present_menu() -> None:
         8: command_sort_movies_by_rating,
         9: command_sort_movies_by_year,
         10: command_filter_movies,
-        11: command_export_to_html
+        11: command_export_to_html,
+        12: command_find_duplicates
     }
 
     if choice in options:
@@ -316,9 +424,36 @@ def present_menu() -> None:
         print("\033[31mInput not valid, please try again\033[0m")
         present_menu()
 
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """Parse command-line arguments; without a command the interactive menu starts."""
+    parser = argparse.ArgumentParser(description="My Movies Database")
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve_parser = subparsers.add_parser("serve", help="serve all collections over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to bind to")
+    serve_parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+
+    import_parser = subparsers.add_parser("import-imdb", help="build the offline title database from IMDb dumps")
+    import_parser.add_argument("basics", help="path to title.basics.tsv(.gz)")
+    import_parser.add_argument("ratings", nargs="?", help="path to title.ratings.tsv(.gz)")
+
+    return parser.parse_args(argv)
+
 def main() -> None:
     """Initialize the application and launch the main menu."""
     global current_user_id
+    args = parse_args(sys.argv[1:])
+    if args.command == "serve":
+        from server import run_server
+        run_server(args.host, args.port)
+        return
+    if args.command == "import-imdb":
+        from api.imdb_dataset import import_dataset
+        print("⏳ Importing IMDb dataset, this can take a while...")
+        counts = import_dataset(args.basics, args.ratings)
+        print(f"✅ Imported {counts['titles']} titles and {counts['ratings']} ratings.")
+        return
+
     print("********** My Movies Database **********")
     current_user_id = choose_user()
     present_menu()
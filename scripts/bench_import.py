@@ -0,0 +1,68 @@
+"""
+Import-time benchmark for the modules used by read-only commands.
+
+Each module is imported in a fresh interpreter (best of several runs) and
+the script checks that importing it did not pull in the HTTP client or the
+.env loader, and did not open the database.
+
+Usage:
+    python scripts/bench_import.py [--runs 5]
+
+Exits with status 1 if a forbidden module was loaded or the engine was created.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ["storage.movie_storage_sql", "html_generator"]
+FORBIDDEN = ["requests", "dotenv"]  # only needed once a network call is made
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+module = __import__({module!r}, fromlist=["_"])
+elapsed = time.perf_counter() - start
+from storage import movie_storage_sql
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {forbidden!r} if name in sys.modules],
+    "engine_created": movie_storage_sql._engine is not None,
+}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Import module in a fresh interpreter and return the probe's report."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, forbidden=FORBIDDEN)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="imports per module (best is reported)")
+    args = parser.parse_args()
+
+    ok = True
+    for module in MODULES:
+        reports = [measure(module) for _ in range(args.runs)]
+        best = min(report["seconds"] for report in reports)
+        loaded = sorted({name for report in reports for name in report["loaded"]})
+        engine_created = any(report["engine_created"] for report in reports)
+
+        status = "ok"
+        if loaded or engine_created:
+            ok = False
+            status = f"FAIL (loaded: {', '.join(loaded) or '-'}, engine created: {engine_created})"
+        print(f"{module:<30} {best * 1000:7.1f} ms  {status}")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Multi-process write stress test for storage.movie_storage_sql.
+
+Spawns several processes that write to one temporary database at the same
+time: each inserts movies and increments a shared counter with
+read-modify-write transactions. Afterwards it reports the write throughput
+and checks that no insert or increment was lost.
+
+Usage:
+    python scripts/stress_writes.py [--processes 8] [--writes 50]
+
+Exits with status 1 if any update was lost or a worker failed.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+COUNTER_TITLE = "__counter__"
+
+
+def worker(worker_id: int, writes: int, user_id: int, errors) -> None:
+    """Insert `writes` movies and increment the counter `writes` times."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import SQLAlchemyError
+    from storage import movie_storage_sql as storage
+
+    def increment(connection) -> None:
+        # Read and write in separate statements: only a proper write
+        # transaction keeps concurrent increments from overwriting each other
+        value = connection.execute(text("""
+            SELECT rating FROM movies WHERE title = :title AND user_id = :user_id
+        """), {"title": COUNTER_TITLE, "user_id": user_id}).scalar_one()
+        connection.execute(text("""
+            UPDATE movies SET rating = :value WHERE title = :title AND user_id = :user_id
+        """), {"value": value + 1, "title": COUNTER_TITLE, "user_id": user_id})
+
+    for i in range(writes):
+        try:
+            with storage.batch() as tx:
+                tx.add_movie(f"Movie {worker_id}-{i}", 2000, 5.0, "", user_id)
+            storage.run_write(increment)
+        except SQLAlchemyError as e:
+            with errors.get_lock():
+                errors.value += 1
+            print(f"⚠️ Worker {worker_id}: {e}", file=sys.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=8, help="number of writer processes")
+    parser.add_argument("--writes", type=int, default=50, help="inserts and increments per process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Set before importing storage so this process and the workers use the temp DB
+        os.environ["MOVIES_DB_PATH"] = os.path.join(tmp_dir, "stress.db")
+        from storage import movie_storage_sql as storage
+
+        with storage.batch() as tx:
+            tx.add_user("stress")
+        user_id = storage.get_user_id("stress")
+        with storage.batch() as tx:
+            tx.add_movie(COUNTER_TITLE, 0, 0.0, "", user_id)
+
+        context = multiprocessing.get_context("spawn")
+        errors = context.Value("i", 0)
+        processes = [
+            context.Process(target=worker, args=(n, args.writes, user_id, errors))
+            for n in range(args.processes)
+        ]
+
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        expected = args.processes * args.writes
+        counter = next(m for m in storage.get_user_movies(user_id) if m.title == COUNTER_TITLE).rating
+        inserted = storage.count_movies(user_id) - 1
+        lost = (expected - int(counter)) + (expected - inserted)
+        failed_workers = sum(1 for process in processes if process.exitcode != 0)
+
+        print(f"Processes: {args.processes}, writes per process: {2 * args.writes}")
+        print(f"Elapsed: {elapsed:.2f}s, throughput: {2 * expected / elapsed:.1f} writes/s")
+        print(f"Counter: {int(counter)}/{expected}, inserted: {inserted}/{expected}")
+        print(f"Failed writes: {errors.value}, failed workers: {failed_workers}, lost updates: {lost}")
+
+        storage.get_engine().dispose()
+
+    return 1 if lost or errors.value or failed_workers else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from html import escape
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from html_generator import render_html
+from storage import movie_storage_sql as storage
+
+BASE_DIR = Path(__file__).resolve().parent
+TEMPLATE_PATH = BASE_DIR / "static" / "index_template.html"
+STYLESHEET_PATH = BASE_DIR / "style.css"
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+MAX_PAGE = 1_000_000  # keeps the OFFSET well inside SQLite's 64-bit integers
+CACHE_SIZE = 256
+
+
+class HTTPError(Exception):
+    """An error that should be sent to the client with the given status."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class CachedResponse:
+    """A rendered response together with its validators."""
+
+    def __init__(self, version: tuple, body: bytes, content_type: str, last_modified: float):
+        self.version = version
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.last_modified = last_modified
+
+    def has_stable_last_modified(self) -> bool:
+        """
+        HTTP dates only have whole seconds, so a Last-Modified is only a safe
+        validator once its second is over: a second write within the same
+        second would otherwise carry the same date.
+        """
+        return time.time() - self.last_modified >= 1
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of rendered responses.
+
+    Entries are tagged with the data version they were rendered from and are
+    discarded as soon as the version changes, i.e. after any write.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: tuple) -> Optional[CachedResponse]:
+        """Return the cached response for key if it is still current."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Store a response, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+cache = ResponseCache()
+
+
+def _get_int(query: dict, name: str, default: int, minimum: int, maximum: Optional[int] = None) -> int:
+    """Read a bounded integer query parameter."""
+    raw = query.get(name, [str(default)])[0]
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' is out of range")
+    return value
+
+
+def _get_user(user_id: int):
+    """Return the user row for user_id or raise a 404."""
+    for user in storage.list_users():
+        if user.id == user_id:
+            return user
+    raise HTTPError(HTTPStatus.NOT_FOUND, f"User {user_id} not found")
+
+
+def _query_movies(user_id: int, query: dict) -> dict:
+    """Run a paginated movie query from request parameters."""
+    page = _get_int(query, "page", 1, 1, MAX_PAGE)
+    per_page = _get_int(query, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    sort_by = query.get("sort", ["title"])[0]
+    order = query.get("order", ["asc"])[0]
+    search = query.get("q", [None])[0]
+
+    if sort_by not in storage.SORT_COLUMNS:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Cannot sort by '{sort_by}'")
+    if order not in ("asc", "desc"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "'order' must be 'asc' or 'desc'")
+
+    min_rating = None
+    if "min_rating" in query:
+        try:
+            min_rating = float(query["min_rating"][0])
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'min_rating' must be a number")
+        if not math.isfinite(min_rating):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'min_rating' must be a finite number")
+
+    movies, total = storage.get_movies_page(
+        user_id,
+        sort_by=sort_by,
+        descending=order == "desc",
+        min_rating=min_rating,
+        search=search,
+        limit=per_page,
+        offset=(page - 1) * per_page
+    )
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": (total + per_page - 1) // per_page,
+        "movies": movies
+    }
+
+
+def _movie_to_dict(movie) -> dict:
+    """Convert a movie row to a JSON-serializable dict."""
+    return {
+        "title": movie.title,
+        "year": movie.year,
+        "rating": movie.rating,
+        "poster_url": movie.poster_url,
+        "note": movie.note
+    }
+
+
+def render_users(query: dict) -> tuple[bytes, str]:
+    """GET /api/users"""
+    users = [{"id": user.id, "name": user.name} for user in storage.list_users()]
+    return json.dumps({"users": users}).encode("utf-8"), "application/json"
+
+
+def render_movies_json(user_id: int, query: dict) -> tuple[bytes, str]:
+    """GET /api/users/<id>/movies"""
+    _get_user(user_id)
+    result = _query_movies(user_id, query)
+    result["movies"] = [_movie_to_dict(m) for m in result["movies"]]
+    return json.dumps(result).encode("utf-8"), "application/json"
+
+
+def render_stats_json(user_id: int, query: dict) -> tuple[bytes, str]:
+    """GET /api/users/<id>/stats"""
+    _get_user(user_id)
+    stats = storage.get_movie_stats(user_id) or {"total": 0}
+    return json.dumps(stats).encode("utf-8"), "application/json"
+
+
+def render_movies_html(user_id: int, query: dict) -> tuple[bytes, str]:
+    """GET /users/<id>"""
+    _get_user(user_id)
+    result = _query_movies(user_id, query)
+
+    def page_link(page: int) -> str:
+        # Keep sorting, filters and page size; only the page changes
+        return escape("?" + urlencode({**query, "page": [str(page)]}, doseq=True))
+
+    links = []
+    if result["page"] > 1:
+        links.append(f'<a href="{page_link(result["page"] - 1)}">&laquo; Previous</a>')
+    if result["page"] < result["pages"]:
+        links.append(f'<a href="{page_link(result["page"] + 1)}">Next &raquo;</a>')
+    footer = f'<nav class="pagination">{" ".join(links)}</nav>' if links else ""
+
+    html_output = render_html(result["movies"], str(TEMPLATE_PATH), resolve_imdb=False, footer_html=footer)
+    return html_output.encode("utf-8"), "text/html; charset=utf-8"
+
+
+def render_stylesheet(query: dict) -> tuple[bytes, str]:
+    """GET /style.css"""
+    return STYLESHEET_PATH.read_bytes(), "text/css; charset=utf-8"
+
+
+ROUTES: list[tuple[re.Pattern, Callable[..., tuple[bytes, str]]]] = [
+    (re.compile(r"^/api/users/?$"), render_users),
+    (re.compile(r"^/api/users/(\d+)/movies/?$"), render_movies_json),
+    (re.compile(r"^/api/users/(\d+)/stats/?$"), render_stats_json),
+    (re.compile(r"^/users/(\d+)/?$"), render_movies_html),
+    (re.compile(r"^/style\.css$"), render_stylesheet),
+]
+
+
+class MovieRequestHandler(BaseHTTPRequestHandler):
+    """Serve cached JSON and HTML views of the movie database."""
+
+    server_version = "MovieManager/1.0"
+
+    def do_GET(self) -> None:
+        """Handle a GET request, answering from the cache when possible."""
+        parts = urlsplit(self.path)
+        try:
+            entry = self._get_response(parts.path, parts.query)
+        except HTTPError as e:
+            self._send_error(e.status, e.message)
+            return
+        except Exception as e:
+            self.log_error("Error handling %s: %r", self.path, e)
+            traceback.print_exc()
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+            return
+
+        if self._not_modified(entry):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(entry)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", entry.content_type)
+        self.send_header("Content-Length", str(len(entry.body)))
+        self._send_validators(entry)
+        self.end_headers()
+        self.wfile.write(entry.body)
+
+    def _get_response(self, path: str, query_string: str) -> CachedResponse:
+        """Look up the route for path and return a (possibly cached) response."""
+        for pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for '{path}'")
+
+        if handler is render_stylesheet:
+            mtime = STYLESHEET_PATH.stat().st_mtime
+            version = (0, int(mtime * 1e9))
+        else:
+            version = storage.get_data_version()
+            mtime = version[1] / 1e9
+
+        key = f"{path}?{query_string}"
+        entry = cache.get(key, version)
+        if entry is None:
+            query = parse_qs(query_string)
+            args = [int(group) for group in match.groups()]
+            body, content_type = handler(*args, query)
+            entry = CachedResponse(version, body, content_type, mtime)
+            cache.put(key, entry)
+        return entry
+
+    def _not_modified(self, entry: CachedResponse) -> bool:
+        """Check the request's conditional headers against entry."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or entry.etag in tags
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and entry.has_stable_last_modified():
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(entry.last_modified) <= since
+        return False
+
+    def _send_validators(self, entry: CachedResponse) -> None:
+        """Send ETag, Last-Modified and Cache-Control headers."""
+        self.send_header("ETag", entry.etag)
+        if entry.has_stable_last_modified():
+            self.send_header("Last-Modified", formatdate(int(entry.last_modified), usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        """Send a JSON error response."""
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8000) -> None:
+    """
+    Serve the movie database over HTTP until interrupted.
+
+    Args:
+        host (str): Interface to bind to.
+        port (int): Port to listen on.
+    """
+    httpd = ThreadingHTTPServer((host, port), MovieRequestHandler)
+    print(f"🌐 Serving movies on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+    finally:
+        httpd.server_close()
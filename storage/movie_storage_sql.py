@@ -1,18 +1,46 @@
 import os
-from typing import Optional, Union
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import SQLAlchemyError
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Callable, Iterator, Optional, Sequence, TypeVar, Union
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+T = TypeVar("T")
 
 # Constants for DB path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, "data", "movies.db")
+DB_PATH = os.getenv("MOVIES_DB_PATH", os.path.join(BASE_DIR, "data", "movies.db"))
 DB_URL = f"sqlite:///{DB_PATH}"
 
-# Engine with SQLAlchemy
-engine = create_engine(DB_URL, echo=False)
+# Concurrency settings (several CLI processes may share one database file)
+BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "5"))  # seconds SQLite waits for a lock
+WRITE_RETRIES = int(os.getenv("DB_WRITE_RETRIES", "5"))  # extra attempts when still busy
+RETRY_BACKOFF = 0.05  # base delay in seconds, doubled on every retry
 
-# Create tables on first run
-with engine.connect() as connection:
+# Engine with SQLAlchemy, created lazily by get_engine()
+_engine: Optional[Engine] = None
+_write_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    """Disable pysqlite's own transaction handling so we can issue BEGIN ourselves."""
+    dbapi_connection.isolation_level = None
+
+
+def _on_begin(connection: Connection) -> None:
+    """Start transactions in the mode requested via the 'sqlite_begin' option."""
+    mode = connection.get_execution_options().get("sqlite_begin", "DEFERRED")
+    connection.exec_driver_sql(f"BEGIN {mode}")
+
+
+def _migrate_v1(connection: Connection) -> None:
+    """Create the users and movies tables (version column included)."""
     connection.execute(text("""
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -29,28 +57,306 @@ with engine.connect() as connection:
             poster_url TEXT,
             note TEXT,
             user_id INTEGER NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY(user_id) REFERENCES users(id),
             UNIQUE(title, user_id)
         );
     """))
 
-    connection.commit()
+    # Databases created before optimistic locking lack the version column
+    columns = {row.name for row in connection.execute(text("PRAGMA table_info(movies)"))}
+    if "version" not in columns:
+        connection.execute(text("ALTER TABLE movies ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+
+
+def _migrate_v2(connection: Connection) -> None:
+    """Add indexes for the movie query builder and a full-text index on titles."""
+    # SQLite appends the rowid to every index, so (user_id, column) is already
+    # ordered by (column, id): sorted pages need no temp B-tree and range
+    # counts are answered from the index alone.
+    connection.execute(text("CREATE INDEX IF NOT EXISTS idx_movies_user_title ON movies (user_id, title)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS idx_movies_user_year ON movies (user_id, year)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS idx_movies_user_rating ON movies (user_id, rating)"))
+
+    connection.execute(text("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts
+        USING fts5(title, content='movies', content_rowid='id')
+    """))
+    connection.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+            INSERT INTO movies_fts (rowid, title) VALUES (new.id, new.title);
+        END
+    """))
+    connection.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+            INSERT INTO movies_fts (movies_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END
+    """))
+    connection.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title ON movies BEGIN
+            INSERT INTO movies_fts (movies_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO movies_fts (rowid, title) VALUES (new.id, new.title);
+        END
+    """))
+    connection.execute(text("INSERT INTO movies_fts (movies_fts) VALUES ('rebuild')"))
+
+
+def _migrate_v3(connection: Connection) -> None:
+    """Add the local title alias index used to resolve titles without OMDb requests."""
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS omdb_titles (
+            imdb_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            rating REAL NOT NULL,
+            poster_url TEXT
+        );
+    """))
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS title_aliases (
+            query TEXT NOT NULL,
+            imdb_id TEXT NOT NULL REFERENCES omdb_titles(imdb_id),
+            position INTEGER NOT NULL,
+            PRIMARY KEY (query, position)
+        ) WITHOUT ROWID;
+    """))
+
+
+# Schema migrations in order; the database stores how many have been applied
+MIGRATIONS: list[Callable[[Connection], None]] = [_migrate_v1, _migrate_v2, _migrate_v3]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def _ensure_schema(engine: Engine) -> None:
+    """Apply pending migrations, skipping all DDL if the schema is up to date."""
+    with engine.connect() as connection:
+        if connection.execute(text("PRAGMA user_version")).scalar_one() == SCHEMA_VERSION:
+            return
+
+    with engine.execution_options(sqlite_begin="IMMEDIATE").begin() as connection:
+        # Re-check under the write lock: another process may have migrated meanwhile
+        current = connection.execute(text("PRAGMA user_version")).scalar_one()
+        for migration in MIGRATIONS[current:]:
+            migration(connection)
+        connection.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+
+def get_engine() -> Engine:
+    """
+    Get the shared engine, creating it and checking the schema on first use.
+
+    Returns:
+        Engine: SQLAlchemy engine for the movie database.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(DB_URL, echo=False, connect_args={"timeout": BUSY_TIMEOUT})
+                event.listen(engine, "connect", _on_connect)
+                event.listen(engine, "begin", _on_begin)
+                _ensure_schema(engine)
+                _engine = engine
+    return _engine
+
+
+def get_write_engine() -> Engine:
+    """
+    Get an engine whose transactions take the write lock up front (BEGIN IMMEDIATE),
+    so writers wait for each other at the start instead of failing halfway through.
+
+    Returns:
+        Engine: The shared engine with IMMEDIATE transactions.
+    """
+    global _write_engine
+    if _write_engine is None:
+        _write_engine = get_engine().execution_options(sqlite_begin="IMMEDIATE")
+    return _write_engine
+
+
+# Columns the movie queries may sort by (maps public name -> SQL column)
+SORT_COLUMNS = {"title": "movies.title", "year": "movies.year", "rating": "movies.rating", "added": "movies.id"}
+
+# Bumped after every write from this process; combined with the DB file's
+# mtime it tells readers (e.g. the HTTP server cache) whether data changed.
+_write_generation = 0
+
+
+def _mark_modified() -> None:
+    """Record that this process has written to the database."""
+    global _write_generation
+    _write_generation += 1
+
+
+def get_data_version() -> tuple[int, int]:
+    """
+    Get a token that changes whenever the movie data changes.
+
+    Returns:
+        tuple: (in-process write counter, database file mtime in ns).
+    """
+    try:
+        mtime_ns = os.stat(DB_PATH).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    return _write_generation, mtime_ns
+
+
+def _is_busy_error(error: OperationalError) -> bool:
+    """Check whether an error was caused by another connection holding the lock."""
+    message = str(error.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def run_write(work: Callable[[Connection], T]) -> T:
+    """
+    Run a write in its own BEGIN IMMEDIATE transaction.
+
+    If the database stays locked by another process for longer than
+    BUSY_TIMEOUT, the whole transaction is retried up to WRITE_RETRIES times
+    with exponential backoff and jitter before the error is raised.
 
+    Args:
+        work (Callable): Function that performs the statements on the given connection.
 
-def add_user(name: str) -> None:
+    Returns:
+        Whatever work returns.
+    """
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            with get_write_engine().begin() as connection:
+                result = work(connection)
+            _mark_modified()
+            return result
+        except OperationalError as e:
+            if not _is_busy_error(e) or attempt == WRITE_RETRIES:
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+# Mutation statements used by Batch; identical statements are sent as one executemany
+_ADD_USER_SQL = "INSERT INTO users (name) VALUES (:name)"
+_ADD_MOVIE_SQL = """
+    INSERT INTO movies (title, year, rating, poster_url, user_id)
+    VALUES (:title, :year, :rating, :poster_url, :user_id)
+"""
+_DELETE_MOVIE_SQL = "DELETE FROM movies WHERE title = :title AND user_id = :user_id"
+_UPDATE_NOTE_SQL = """
+    UPDATE movies
+    SET note = :note, version = version + 1
+    WHERE title = :title AND user_id = :user_id
+"""
+_UPDATE_MOVIE_SQL = """
+    UPDATE movies
+    SET year = :year, rating = :rating, poster_url = :poster_url, version = version + 1
+    WHERE title = :title AND user_id = :user_id
+      AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+
+@dataclass
+class StatementResult:
+    """Outcome of one executed statement of a batch."""
+    operation: str  # Batch method that queued it, e.g. "add_movie"
+    count: int  # number of queued mutations it covered
+    rowcount: int  # rows affected by all of them together
+
+
+@dataclass
+class Batch:
+    """
+    Unit of work collecting storage mutations for one transaction.
+
+    Create it with batch(); mutations are only buffered until the block ends.
+    """
+    _pending: list[tuple[str, str, dict]] = field(default_factory=list, init=False, repr=False)
+    results: list[StatementResult] = field(default_factory=list, init=False)
+
+    def _queue(self, operation: str, sql: str, params: dict) -> None:
+        self._pending.append((operation, sql, params))
+
+    def add_user(self, name: str) -> None:
+        """Queue adding a user."""
+        self._queue("add_user", _ADD_USER_SQL, {"name": name})
+
+    def add_movie(self, title: str, year: int, rating: float, poster_url: str, user_id: int) -> None:
+        """Queue adding a movie for a user."""
+        self._queue("add_movie", _ADD_MOVIE_SQL, {
+            "title": title, "year": year, "rating": rating, "poster_url": poster_url, "user_id": user_id
+        })
+
+    def delete_movie(self, title: str, user_id: int) -> None:
+        """Queue deleting a user's movie."""
+        self._queue("delete_movie", _DELETE_MOVIE_SQL, {"title": title, "user_id": user_id})
+
+    def update_note(self, title: str, note: str, user_id: int) -> None:
+        """Queue setting the note of a user's movie."""
+        self._queue("update_note", _UPDATE_NOTE_SQL, {"note": note, "title": title, "user_id": user_id})
+
+    def update_movie(self, title: str, year: int, rating: float, poster_url: str, user_id: int,
+                     expected_version: Optional[int] = None) -> None:
+        """Queue updating year, rating and poster of a user's movie (see update_movie)."""
+        self._queue("update_movie", _UPDATE_MOVIE_SQL, {
+            "year": year, "rating": rating, "poster_url": poster_url,
+            "title": title, "user_id": user_id, "expected_version": expected_version
+        })
+
+    def _flush(self, connection: Connection) -> list[StatementResult]:
+        """Execute the queued mutations, merging runs of identical statements."""
+        results = []
+        for (operation, sql), group in groupby(self._pending, key=lambda item: item[:2]):
+            params = [item[2] for item in group]
+            result = connection.execute(text(sql), params if len(params) > 1 else params[0])
+            results.append(StatementResult(operation, len(params), result.rowcount))
+        return results
+
+
+@contextmanager
+def batch() -> Iterator[Batch]:
+    """
+    Group storage mutations into a single transaction.
+
+    Mutations queued inside the block are written in one BEGIN IMMEDIATE
+    transaction when it ends (one commit instead of one per row); consecutive
+    identical statements are sent as a single executemany. If the block
+    raises, nothing is written. If writing fails, the whole batch is rolled
+    back and the error is raised. Afterwards, the batch's results list one
+    StatementResult per executed statement.
+
+    Example:
+        with storage.batch() as tx:
+            tx.add_movie("Alien", 1979, 8.5, poster_url, user_id)
+            tx.update_note("Alien", "Rewatch", user_id)
+        print(tx.results)
+
+    Yields:
+        Batch: The unit of work to queue mutations on.
+    """
+    tx = Batch()
+    yield tx
+    if tx._pending:
+        tx.results = run_write(tx._flush)
+
+
+def add_user(name: str) -> bool:
     """
     Add a new user to the database.
 
     Args:
         name (str): Name of the user to add.
+
+    Returns:
+        bool: True if the user was added.
     """
-    with engine.connect() as connection:
-        try:
-            connection.execute(text("INSERT INTO users (name) VALUES (:name)"), {"name": name})
-            connection.commit()
-            print(f"✅ User '{name}' added successfully.")
-        except SQLAlchemyError as e:
-            print(f"⚠️ Error adding user '{name}': {e}")
+    try:
+        with batch() as tx:
+            tx.add_user(name)
+    except SQLAlchemyError as e:
+        print(f"⚠️ Error adding user '{name}': {e}")
+        return False
+
+    print(f"✅ User '{name}' added successfully.")
+    return True
 
 
 def list_users() -> list[tuple[int, str]]:
@@ -60,7 +366,7 @@ def list_users() -> list[tuple[int, str]]:
     Returns:
         list: A list of (id, name) tuples.
     """
-    with engine.connect() as connection:
+    with get_engine().connect() as connection:
         result = connection.execute(text("SELECT id, name FROM users"))
         return result.fetchall()
 
@@ -75,14 +381,14 @@ def get_user_id(name: str) -> Optional[int]:
     Returns:
         int | None: ID if user exists, otherwise None.
     """
-    with engine.connect() as connection:
+    with get_engine().connect() as connection:
         result = connection.execute(
             text("SELECT id FROM users WHERE name = :name"), {"name": name}
         ).fetchone()
         return result[0] if result else None
 
 
-def add_movie(title: str, year: int, rating: float, poster_url: str, user_id: int) -> None:
+def add_movie(title: str, year: int, rating: float, poster_url: str, user_id: int) -> bool:
     """
     Add a new movie for a user.
 
@@ -92,17 +398,19 @@ def add_movie(title: str, year: int, rating: float, poster_url: str, user_id: in
         rating (float): IMDb rating.
         poster_url (str): URL of poster.
         user_id (int): ID of the user.
+
+    Returns:
+        bool: True if the movie was added.
     """
-    with engine.connect() as connection:
-        try:
-            connection.execute(text("""
-                INSERT INTO movies (title, year, rating, poster_url, user_id)
-                VALUES (:title, :year, :rating, :poster_url, :user_id)
-            """), {"title": title, "year": year, "rating": rating, "poster_url": poster_url, "user_id": user_id})
-            connection.commit()
-            print(f"🎉 Movie '{title}' added for user ID {user_id}.")
-        except SQLAlchemyError as e:
-            print(f"⚠️ Error adding movie '{title}': {e}")
+    try:
+        with batch() as tx:
+            tx.add_movie(title, year, rating, poster_url, user_id)
+    except SQLAlchemyError as e:
+        print(f"⚠️ Error adding movie '{title}': {e}")
+        return False
+
+    print(f"🎉 Movie '{title}' added for user ID {user_id}.")
+    return True
 
 
 def list_movies(user_id: int) -> dict[str, dict[str, Union[str, int, float]]]:
@@ -115,9 +423,9 @@ def list_movies(user_id: int) -> dict[str, dict[str, Union[str, int, float]]]:
     Returns:
         dict: Dictionary of movie data.
     """
-    with engine.connect() as connection:
+    with get_engine().connect() as connection:
         result = connection.execute(text("""
-            SELECT title, year, rating, poster_url
+            SELECT title, year, rating, poster_url, version
             FROM movies
             WHERE user_id = :user_id
         """), {"user_id": user_id})
@@ -128,34 +436,39 @@ def list_movies(user_id: int) -> dict[str, dict[str, Union[str, int, float]]]:
         row.title: {
             "year": row.year,
             "rating": row.rating,
-            "poster_url": row.poster_url
+            "poster_url": row.poster_url,
+            "version": row.version
         }
         for row in rows
     }
 
 
-def delete_movie(title: str, user_id: int) -> None:
+def delete_movie(title: str, user_id: int) -> bool:
     """
     Delete a movie for a user.
 
     Args:
         title (str): Movie title.
         user_id (int): User ID.
+
+    Returns:
+        bool: True if the movie was deleted.
     """
-    with engine.connect() as connection:
-        result = connection.execute(text("""
-            DELETE FROM movies
-            WHERE title = :title AND user_id = :user_id
-        """), {"title": title, "user_id": user_id})
-        connection.commit()
+    try:
+        with batch() as tx:
+            tx.delete_movie(title, user_id)
+    except SQLAlchemyError as e:
+        print(f"⚠️ Error deleting movie '{title}': {e}")
+        return False
 
-        if result.rowcount:
-            print(f"🗑️ Movie '{title}' deleted for user ID {user_id}.")
-        else:
-            print(f"⚠️ Movie '{title}' not found for user ID {user_id}.")
+    if tx.results[0].rowcount:
+        print(f"🗑️ Movie '{title}' deleted for user ID {user_id}.")
+        return True
+    print(f"⚠️ Movie '{title}' not found for user ID {user_id}.")
+    return False
 
 
-def update_note(title: str, note: str, user_id: int) -> None:
+def update_note(title: str, note: str, user_id: int) -> bool:
     """
     Add or update a note for a movie.
 
@@ -163,50 +476,74 @@ def update_note(title: str, note: str, user_id: int) -> None:
         title (str): Movie title.
         note (str): Text note.
         user_id (int): User ID.
+
+    Returns:
+        bool: True if the note was saved.
     """
-    with engine.connect() as connection:
-        result = connection.execute(text("""
-            UPDATE movies
-            SET note = :note
-            WHERE title = :title AND user_id = :user_id
-        """), {"note": note, "title": title, "user_id": user_id})
-        connection.commit()
+    try:
+        with batch() as tx:
+            tx.update_note(title, note, user_id)
+    except SQLAlchemyError as e:
+        print(f"⚠️ Error updating note for '{title}': {e}")
+        return False
 
-        if result.rowcount:
-            print(f"📝 Note added to '{title}' for user ID {user_id}.")
-        else:
-            print(f"⚠️ Movie '{title}' not found for user ID {user_id}.")
+    if tx.results[0].rowcount:
+        print(f"📝 Note added to '{title}' for user ID {user_id}.")
+        return True
+    print(f"⚠️ Movie '{title}' not found for user ID {user_id}.")
+    return False
 
 
-def update_movie(title: str, year: int, rating: float, poster_url: str, user_id: int) -> bool:
+def movie_exists(title: str, user_id: int) -> bool:
+    """
+    Check whether a user has a movie with this exact title.
+
+    Args:
+        title (str): Movie title.
+        user_id (int): User ID.
+
+    Returns:
+        bool: True if the movie exists.
+    """
+    with get_engine().connect() as connection:
+        row = connection.execute(text("""
+            SELECT 1 FROM movies WHERE title = :title AND user_id = :user_id
+        """), {"title": title, "user_id": user_id}).fetchone()
+        return row is not None
+
+
+def update_movie(title: str, year: int, rating: float, poster_url: str, user_id: int,
+                 expected_version: Optional[int] = None) -> bool:
     """
     Update year, rating and poster for a movie.
 
+    When expected_version is given, the update only applies if nobody else
+    changed the movie since it was read (optimistic locking).
+
     Args:
         title (str): Movie title.
         year (int): Release year.
         rating (float): IMDb rating.
         poster_url (str): Poster URL.
         user_id (int): User ID.
+        expected_version (int | None): Version the caller read, as returned by list_movies.
 
     Returns:
         bool: True if update succeeded.
     """
     try:
-        with engine.begin() as connection:
-            result = connection.execute(text("""
-                UPDATE movies
-                SET year = :year, rating = :rating, poster_url = :poster_url
-                WHERE title = :title AND user_id = :user_id
-            """), {
-                "year": year, "rating": rating, "poster_url": poster_url,
-                "title": title, "user_id": user_id
-            })
-            return result.rowcount > 0
+        with batch() as tx:
+            tx.update_movie(title, year, rating, poster_url, user_id, expected_version)
     except SQLAlchemyError as e:
         print(f"❌ Database error during update: {e}")
         return False
 
+    if tx.results[0].rowcount:
+        return True
+    if expected_version is not None and movie_exists(title, user_id):
+        print(f"⚠️ Movie '{title}' was changed by someone else in the meantime. Please reload and try again.")
+    return False
+
 
 def get_user_movies(user_id: int) -> list:
     """
@@ -218,13 +555,149 @@ def get_user_movies(user_id: int) -> list:
     Returns:
         list: List of movie rows.
     """
-    with engine.connect() as connection:
+    with get_engine().connect() as connection:
         result = connection.execute(
             text("SELECT * FROM movies WHERE user_id = :user_id"), {"user_id": user_id}
         )
         return result.fetchall()
 
 
+def _fts_query(words: str) -> str:
+    """Turn user input into an FTS5 query matching all words as prefixes."""
+    tokens = words.split()
+    return " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+
+def build_movie_query(user_id: int,
+                      year_min: Optional[int] = None, year_max: Optional[int] = None,
+                      rating_min: Optional[float] = None, rating_max: Optional[float] = None,
+                      title_contains: Optional[str] = None, title_match: Optional[str] = None,
+                      has_note: Optional[bool] = None,
+                      sort: Sequence[str] = ("title",),
+                      limit: Optional[int] = None, offset: int = 0,
+                      count: bool = False) -> tuple[str, dict]:
+    """
+    Build one parameterized SELECT for any combination of movie filters.
+
+    All criteria are optional and combined with AND. Values are always bound
+    as parameters; only whitelisted column names are put into the SQL.
+
+    Args:
+        user_id (int): User ID.
+        year_min (int | None): Earliest release year (inclusive).
+        year_max (int | None): Latest release year (inclusive).
+        rating_min (float | None): Minimum rating (inclusive).
+        rating_max (float | None): Maximum rating (inclusive).
+        title_contains (str | None): Case-insensitive title substring.
+        title_match (str | None): Words the title must contain (full-text, prefix match).
+        has_note (bool | None): Only movies with (True) or without (False) a note.
+        sort (Sequence[str]): Keys from SORT_COLUMNS; prefix with '-' for descending.
+        limit (int | None): Maximum number of rows.
+        offset (int): Number of rows to skip.
+        count (bool): Build a COUNT(*) query instead (sort/limit are ignored).
+
+    Returns:
+        tuple: (SQL string, parameter dict).
+    """
+    joins = ""
+    conditions = ["movies.user_id = :user_id"]
+    params: dict = {"user_id": user_id}
+
+    if year_min is not None:
+        conditions.append("movies.year >= :year_min")
+        params["year_min"] = year_min
+    if year_max is not None:
+        conditions.append("movies.year <= :year_max")
+        params["year_max"] = year_max
+    if rating_min is not None:
+        conditions.append("movies.rating >= :rating_min")
+        params["rating_min"] = rating_min
+    if rating_max is not None:
+        conditions.append("movies.rating <= :rating_max")
+        params["rating_max"] = rating_max
+    if title_contains:
+        escaped = title_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append("movies.title LIKE :title_contains ESCAPE '\\'")
+        params["title_contains"] = f"%{escaped}%"
+    if title_match and title_match.strip():
+        joins = "JOIN movies_fts ON movies_fts.rowid = movies.id"
+        conditions.append("movies_fts MATCH :title_match")
+        params["title_match"] = _fts_query(title_match)
+    if has_note is True:
+        conditions.append("movies.note IS NOT NULL AND movies.note != ''")
+    elif has_note is False:
+        conditions.append("(movies.note IS NULL OR movies.note = '')")
+
+    where = " AND ".join(conditions)
+    if count:
+        return f"SELECT COUNT(*) FROM movies {joins} WHERE {where}", params
+
+    order_terms = []
+    for key in sort:
+        column = SORT_COLUMNS.get(key.lstrip("-"))
+        if column is None:
+            raise ValueError(f"Cannot sort by '{key.lstrip('-')}'")
+        direction = "DESC" if key.startswith("-") else "ASC"
+        order_terms.append(f"{column} {direction}")
+    # Stable order for pagination; matches the rowid suffix of the indexes
+    order_terms.append(f"movies.id {direction if sort else 'ASC'}")
+
+    sql = f"SELECT movies.* FROM movies {joins} WHERE {where} ORDER BY {', '.join(order_terms)}"
+    if limit is not None:
+        sql += " LIMIT :limit OFFSET :offset"
+        params.update(limit=limit, offset=offset)
+    return sql, params
+
+
+def query_movies(user_id: int, **criteria) -> list:
+    """
+    Get a user's movies matching the given criteria.
+
+    Args:
+        user_id (int): User ID.
+        **criteria: Any keyword arguments accepted by build_movie_query.
+
+    Returns:
+        list: List of movie rows.
+    """
+    sql, params = build_movie_query(user_id, **criteria)
+    with get_engine().connect() as connection:
+        return connection.execute(text(sql), params).fetchall()
+
+
+def count_movies(user_id: int, **criteria) -> int:
+    """
+    Count a user's movies matching the given criteria.
+
+    Args:
+        user_id (int): User ID.
+        **criteria: Filter keyword arguments accepted by build_movie_query.
+
+    Returns:
+        int: Number of matching movies.
+    """
+    criteria = {k: v for k, v in criteria.items() if k not in ("sort", "limit", "offset")}
+    sql, params = build_movie_query(user_id, count=True, **criteria)
+    with get_engine().connect() as connection:
+        return connection.execute(text(sql), params).scalar_one()
+
+
+def explain_movie_query(user_id: int, **criteria) -> list[str]:
+    """
+    Get SQLite's query plan for a movie query, e.g. to check which index it uses.
+
+    Args:
+        user_id (int): User ID.
+        **criteria: Any keyword arguments accepted by build_movie_query.
+
+    Returns:
+        list: The 'detail' column of EXPLAIN QUERY PLAN, one entry per step.
+    """
+    sql, params = build_movie_query(user_id, **criteria)
+    with get_engine().connect() as connection:
+        return [row.detail for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)]
+
+
 def get_movies_sorted_by_rating(user_id: int) -> list:
     """
     Get user's movies sorted by rating (desc).
@@ -235,13 +708,7 @@ def get_movies_sorted_by_rating(user_id: int) -> list:
     Returns:
         list: List of movie rows.
     """
-    with engine.connect() as connection:
-        result = connection.execute(text("""
-            SELECT * FROM movies
-            WHERE user_id = :user_id
-            ORDER BY rating DESC
-        """), {"user_id": user_id})
-        return result.fetchall()
+    return query_movies(user_id, sort=("-rating",))
 
 
 def get_movies_sorted_by_year(user_id: int) -> list:
@@ -254,13 +721,7 @@ def get_movies_sorted_by_year(user_id: int) -> list:
     Returns:
         list: List of movie rows.
     """
-    with engine.connect() as connection:
-        result = connection.execute(text("""
-            SELECT * FROM movies
-            WHERE user_id = :user_id
-            ORDER BY year ASC
-        """), {"user_id": user_id})
-        return result.fetchall()
+    return query_movies(user_id, sort=("year",))
 
 
 def filter_movies_by_rating(user_id: int, min_rating: float) -> list:
@@ -274,10 +735,132 @@ def filter_movies_by_rating(user_id: int, min_rating: float) -> list:
     Returns:
         list: List of movie rows.
     """
-    with engine.connect() as connection:
-        result = connection.execute(text("""
-            SELECT * FROM movies
-            WHERE user_id = :user_id AND rating >= :min_rating
-        """), {"user_id": user_id, "min_rating": min_rating})
-        return result.fetchall()
+    return query_movies(user_id, rating_min=min_rating)
+
+
+def get_movies_page(user_id: int, sort_by: str = "title", descending: bool = False,
+                    min_rating: Optional[float] = None, search: Optional[str] = None,
+                    limit: int = 20, offset: int = 0) -> tuple[list, int]:
+    """
+    Get one page of a user's movies, optionally filtered and sorted.
+
+    Args:
+        user_id (int): User ID.
+        sort_by (str): One of SORT_COLUMNS.
+        descending (bool): Sort in descending order.
+        min_rating (float | None): Minimum rating, if any.
+        search (str | None): Case-insensitive title substring, if any.
+        limit (int): Maximum number of rows to return.
+        offset (int): Number of rows to skip.
+
+    Returns:
+        tuple: (list of movie rows, total number of matching movies).
+    """
+    criteria = {"rating_min": min_rating, "title_contains": search}
+    sort = (f"-{sort_by}" if descending else sort_by,)
+    movies = query_movies(user_id, sort=sort, limit=limit, offset=offset, **criteria)
+    return movies, count_movies(user_id, **criteria)
+
+
+def get_movie_stats(user_id: int) -> Optional[dict]:
+    """
+    Get aggregate statistics for a user's movies.
+
+    Args:
+        user_id (int): User ID.
+
+    Returns:
+        dict | None: Total, average rating, best and worst movie, or None if the user has no movies.
+    """
+    with get_engine().connect() as connection:
+        row = connection.execute(text("""
+            SELECT COUNT(*) AS total, AVG(rating) AS average
+            FROM movies
+            WHERE user_id = :user_id
+        """), {"user_id": user_id}).fetchone()
+        if not row.total:
+            return None
 
+        best = connection.execute(text("""
+            SELECT title, rating FROM movies
+            WHERE user_id = :user_id
+            ORDER BY rating DESC LIMIT 1
+        """), {"user_id": user_id}).fetchone()
+        worst = connection.execute(text("""
+            SELECT title, rating FROM movies
+            WHERE user_id = :user_id
+            ORDER BY rating ASC LIMIT 1
+        """), {"user_id": user_id}).fetchone()
+
+    return {
+        "total": row.total,
+        "average_rating": round(row.average, 2),
+        "best": {"title": best.title, "rating": best.rating},
+        "worst": {"title": worst.title, "rating": worst.rating}
+    }
+
+
+def get_title_aliases(query: str) -> list[dict]:
+    """
+    Get the movies a title query resolved to before, in ranked order.
+
+    Args:
+        query (str): Normalized title query.
+
+    Returns:
+        list: Movie data dicts (title, year, rating, poster_url, imdb_id); empty if the query is unknown.
+    """
+    with get_engine().connect() as connection:
+        rows = connection.execute(text("""
+            SELECT t.imdb_id, t.title, t.year, t.rating, t.poster_url
+            FROM title_aliases a
+            JOIN omdb_titles t ON t.imdb_id = a.imdb_id
+            WHERE a.query = :query
+            ORDER BY a.position
+        """), {"query": query}).fetchall()
+
+    return [
+        {
+            "title": row.title,
+            "year": row.year,
+            "rating": row.rating,
+            "poster_url": row.poster_url,
+            "imdb_id": row.imdb_id
+        }
+        for row in rows
+    ]
+
+
+def save_title_aliases(query: str, candidates: list[dict]) -> None:
+    """
+    Remember the ranked movies a title query resolved to, replacing earlier results.
+
+    Args:
+        query (str): Normalized title query.
+        candidates (list): Movie data dicts with an imdb_id, best match first.
+    """
+    candidates = [c for c in candidates if c.get("imdb_id")]
+
+    def work(connection: Connection) -> None:
+        connection.execute(text("DELETE FROM title_aliases WHERE query = :query"), {"query": query})
+        if not candidates:
+            return
+        connection.execute(text("""
+            INSERT INTO omdb_titles (imdb_id, title, year, rating, poster_url)
+            VALUES (:imdb_id, :title, :year, :rating, :poster_url)
+            ON CONFLICT(imdb_id) DO UPDATE SET
+                title = excluded.title, year = excluded.year,
+                rating = excluded.rating, poster_url = excluded.poster_url
+        """), candidates)
+        connection.execute(text("""
+            INSERT INTO title_aliases (query, imdb_id, position)
+            VALUES (:query, :imdb_id, :position)
+        """), [
+            {"query": query, "imdb_id": c["imdb_id"], "position": position}
+            for position, c in enumerate(candidates)
+        ])
+
+    try:
+        run_write(work)
+    except SQLAlchemyError as e:
+        print(f"⚠️ Could not save title aliases for '{query}': {e}")
@@ -0,0 +1,63 @@
+import gzip
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+BASICS_HEADER = "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres"
+RATINGS_HEADER = "tconst\taverageRating\tnumVotes"
+
+
+def write_dump(path: Path, header: str, rows: list[tuple]) -> str:
+    """Write rows as a gzip-compressed IMDb TSV dump and return its path."""
+    lines = [header] + ["\t".join(str(field) for field in row) for row in rows]
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def imdb_dumps(tmp_path):
+    """
+    Small title.basics/title.ratings dumps: a few well-known movies, a
+    non-movie row, and 3000 low-voted "Star ..." titles that sort before
+    the real Star Wars entry.
+    """
+    movies = [
+        ("tt0133093", "movie", "The Matrix", 1999, "8.7", 2000000),
+        ("tt0234215", "movie", "The Matrix Reloaded", 2003, "7.2", 600000),
+        ("tt0111161", "movie", "The Shawshank Redemption", 1994, "9.3", 2900000),
+        ("tt0076759", "movie", "Star Wars: Episode IV - A New Hope", 1977, "8.6", 1400000),
+        ("tt0211915", "movie", "Amélie", 2001, "8.3", 780000),
+        ("tt1375666", "movie", "Inception", 2010, "8.8", 2600000),
+        ("tt0068646", "movie", "The Godfather", 1972, "9.2", 2000000),
+        ("tt0903747", "tvSeries", "Breaking Bad", 2008, "9.5", 2100000),
+    ]
+    junk = [(f"tt9{n:06d}", "movie", f"Star a{n:04d}", 2010, "5.0", 10) for n in range(3000)]
+
+    basics = [
+        (tconst, kind, title, title, 0, year, "\\N", 120, "Drama")
+        for tconst, kind, title, year, _, _ in movies + junk
+    ]
+    ratings = [(tconst, rating, votes) for tconst, _, _, _, rating, votes in movies + junk]
+    return (
+        write_dump(tmp_path / "title.basics.tsv.gz", BASICS_HEADER, basics),
+        write_dump(tmp_path / "title.ratings.tsv.gz", RATINGS_HEADER, ratings),
+    )
+
+
+@pytest.fixture
+def movie_storage(tmp_path, monkeypatch):
+    """storage.movie_storage_sql pointed at an empty temporary database."""
+    from storage import movie_storage_sql as storage
+
+    db_path = str(tmp_path / "movies.db")
+    monkeypatch.setattr(storage, "DB_PATH", db_path)
+    monkeypatch.setattr(storage, "DB_URL", f"sqlite:///{db_path}")
+    monkeypatch.setattr(storage, "_engine", None)
+    monkeypatch.setattr(storage, "_write_engine", None)
+    yield storage
+    if storage._engine is not None:
+        storage._engine.dispose()
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+from dedup import find_duplicate_clusters, suggest_merge
+
+Movie = namedtuple("Movie", "title year poster_url note")
+
+
+def clusters_of(*movies) -> list[set[str]]:
+    """Run find_duplicate_clusters and return the clusters as sets of titles."""
+    return [{movie.title for movie in cluster} for cluster in find_duplicate_clusters(movies)]
+
+
+def test_finds_spelling_variants():
+    assert clusters_of(
+        Movie("The Matrix", 1999, "", ""),
+        Movie("Matrix", 1999, "", ""),
+        Movie("The Shawshank Redemption", 1994, "", ""),
+        Movie("Shawshank Redemtion", 1994, "", ""),
+    ) == [{"The Matrix", "Matrix"}, {"The Shawshank Redemption", "Shawshank Redemtion"}]
+
+
+def test_sequel_numbers_may_be_roman():
+    assert clusters_of(
+        Movie("The Godfather Part II", 1974, "", ""),
+        Movie("Godfather: Part 2", 1974, "", ""),
+    ) == [{"The Godfather Part II", "Godfather: Part 2"}]
+
+
+def test_title_contained_in_another_is_not_a_duplicate():
+    assert clusters_of(
+        Movie("Up", 2009, "", ""),
+        Movie("Up in the Air", 2009, "", ""),
+    ) == []
+
+
+def test_title_with_subtitle_or_episode_is_a_duplicate():
+    assert clusters_of(
+        Movie("Star Wars", 1977, "", ""),
+        Movie("Star Wars: Episode IV", 1977, "", ""),
+        Movie("Star Wars: Episode IV - A New Hope", 1977, "", ""),
+    ) == [{"Star Wars", "Star Wars: Episode IV", "Star Wars: Episode IV - A New Hope"}]
+    assert clusters_of(
+        Movie("Star Wars", 1977, "", ""),
+        Movie("Star Wars Episode IV", 1977, "", ""),
+    ) == [{"Star Wars", "Star Wars Episode IV"}]
+
+
+def test_subtitle_needs_the_same_year():
+    assert clusters_of(
+        Movie("Star Wars", 1977, "", ""),
+        Movie("Star Wars: The Empire Strikes Back", 1978, "", ""),
+    ) == []
+
+
+def test_sequels_are_not_duplicates():
+    assert clusters_of(
+        Movie("Kill Bill: Vol. 1", 2003, "", ""),
+        Movie("Kill Bill: Vol. 2", 2004, "", ""),
+    ) == []
+
+
+def test_years_must_be_close():
+    assert clusters_of(
+        Movie("Dune", 1984, "", ""),
+        Movie("Dune", 2021, "", ""),
+    ) == []
+
+
+def test_suggest_merge_keeps_movie_with_poster():
+    plain = Movie("Matrix", 1999, "", "")
+    with_poster = Movie("The Matrix", 1999, "https://example.com/poster.jpg", "")
+    assert suggest_merge([plain, with_poster]) == (with_poster, [plain])
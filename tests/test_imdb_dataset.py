@@ -0,0 +1,72 @@
+import pytest
+
+from api import imdb_dataset
+
+
+@pytest.fixture
+def dataset_db(tmp_path, imdb_dumps):
+    """An offline title database imported from the fixture dumps."""
+    db_path = str(tmp_path / "imdb.db")
+    counts = imdb_dataset.import_dataset(*imdb_dumps, db_path=db_path, chunk_size=500)
+    assert counts == {"titles": 3007, "ratings": 3007}
+    return db_path
+
+
+def test_normalize_title():
+    assert imdb_dataset.normalize_title("The Lord of the Rings: The Two Towers") == "lord of the rings the two towers"
+    assert imdb_dataset.normalize_title("Amélie") == "amelie"
+    assert imdb_dataset.normalize_title("Fast & Furious") == "fast and furious"
+
+
+def test_import_skips_non_movies(dataset_db):
+    assert imdb_dataset.lookup_title("Breaking Bad", dataset_db) is None
+
+
+def test_reimport_replaces_data(dataset_db, imdb_dumps):
+    counts = imdb_dataset.import_dataset(*imdb_dumps, db_path=dataset_db)
+    assert counts["titles"] == 3007
+    assert len(imdb_dataset.find_titles("The Matrix", 10, dataset_db, fuzzy=False)) == 1
+
+
+def test_exact_lookup(dataset_db):
+    movie = imdb_dataset.lookup_title("The Matrix", dataset_db)
+    assert movie["imdb_id"] == "tt0133093"
+    assert movie["year"] == 1999
+    assert movie["rating"] == 8.7
+
+
+def test_normalized_lookup(dataset_db):
+    assert imdb_dataset.lookup_title("amelie", dataset_db)["imdb_id"] == "tt0211915"
+    assert imdb_dataset.lookup_title("matrix", dataset_db, fuzzy=False)["imdb_id"] == "tt0133093"
+
+
+def test_fuzzy_lookup_accepts_typos(dataset_db):
+    assert imdb_dataset.lookup_title("Shawshank Redemtion", dataset_db)["imdb_id"] == "tt0111161"
+    assert imdb_dataset.lookup_title("Shawshank Redemtion", dataset_db, fuzzy=False) is None
+
+
+def test_fuzzy_lookup_accepts_typo_in_only_word(dataset_db):
+    assert imdb_dataset.lookup_title("Inceptoin", dataset_db)["imdb_id"] == "tt1375666"
+    assert imdb_dataset.lookup_title("Godfater", dataset_db)["imdb_id"] == "tt0068646"
+    assert imdb_dataset.lookup_title("The Matrx", dataset_db)["imdb_id"] == "tt0133093"
+
+
+def test_fuzzy_lookup_rejects_partial_matches(dataset_db):
+    assert imdb_dataset.lookup_title("the matrix reloaded", dataset_db)["imdb_id"] == "tt0234215"
+    assert imdb_dataset.lookup_title("the matrix revolutions", dataset_db) is None
+
+
+def test_fuzzy_candidates_are_not_cut_off_alphabetically(dataset_db):
+    movie = imdb_dataset.lookup_title("Star Wars Episode 4 new hope", dataset_db)
+    assert movie["imdb_id"] == "tt0076759"
+
+
+def test_unknown_title(dataset_db):
+    assert imdb_dataset.lookup_title("Completely Unknown Film", dataset_db) is None
+    assert imdb_dataset.find_titles("   ", db_path=dataset_db) == []
+
+
+def test_find_titles_ranks_best_first(dataset_db):
+    matches = imdb_dataset.find_titles("The Matrix", 5, dataset_db)
+    assert [movie["imdb_id"] for movie, _ in matches] == ["tt0133093"]
+    assert matches[0][1] == 100
@@ -0,0 +1,114 @@
+import pytest
+
+
+@pytest.fixture
+def user_id(movie_storage):
+    """A user with a few hundred movies, so the planner has indexes worth using."""
+    with movie_storage.batch() as tx:
+        tx.add_user("tester")
+    user_id = movie_storage.get_user_id("tester")
+    with movie_storage.batch() as tx:
+        for n in range(300):
+            tx.add_movie(f"Movie {n}", 1950 + n % 70, round(1 + n % 90 / 10, 1), "", user_id)
+        tx.add_movie("Star Wars", 1977, 8.6, "", user_id)
+        tx.add_movie("Starship Troopers", 1997, 7.3, "", user_id)
+    return user_id
+
+
+def test_year_filter_uses_year_index(movie_storage, user_id):
+    plan = movie_storage.explain_movie_query(user_id, year_min=1990, year_max=1999, sort=("year",))
+    assert any("idx_movies_user_year" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_rating_filter_uses_rating_index(movie_storage, user_id):
+    plan = movie_storage.explain_movie_query(user_id, rating_min=7, sort=("-rating",))
+    assert any("idx_movies_user_rating" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_filters_combine(movie_storage, user_id):
+    movies = movie_storage.query_movies(user_id, year_min=1970, year_max=1980, rating_min=8)
+    assert "Star Wars" in [movie.title for movie in movies]
+    assert all(1970 <= m.year <= 1980 and m.rating >= 8 for m in movies)
+
+
+def test_title_match_uses_full_text_prefixes(movie_storage, user_id):
+    titles = [movie.title for movie in movie_storage.query_movies(user_id, title_match="star")]
+    assert titles == ["Star Wars", "Starship Troopers"]
+    titles = [movie.title for movie in movie_storage.query_movies(user_id, title_match='wars "star')]
+    assert titles == ["Star Wars"]
+    assert movie_storage.count_movies(user_id, title_match="troop") == 1
+
+
+def test_write_wrappers_report_failures(movie_storage, user_id):
+    assert movie_storage.add_movie("Star Wars", 1977, 8.6, "", user_id) is False
+    assert movie_storage.add_user("tester") is False
+    assert movie_storage.delete_movie("Not There", user_id) is False
+    assert movie_storage.update_note("Not There", "note", user_id) is False
+
+    assert movie_storage.add_movie("Alien", 1979, 8.5, "", user_id) is True
+    assert movie_storage.update_note("Alien", "In space no one can hear you scream", user_id) is True
+    assert movie_storage.delete_movie("Alien", user_id) is True
+
+
+def test_add_movie_reports_exhausted_retries(movie_storage, user_id, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+
+    def locked(work):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    run_write = movie_storage.run_write
+    monkeypatch.setattr(movie_storage, "run_write", locked)
+    assert movie_storage.add_movie("Alien", 1979, 8.5, "", user_id) is False
+    monkeypatch.setattr(movie_storage, "run_write", run_write)
+    assert not movie_storage.movie_exists("Alien", user_id)
+
+
+def test_batch_writes_nothing_if_block_raises(movie_storage, user_id):
+    with pytest.raises(RuntimeError):
+        with movie_storage.batch() as tx:
+            tx.add_movie("Alien", 1979, 8.5, "", user_id)
+            raise RuntimeError("cancelled")
+    assert tx.results == []
+    assert not movie_storage.movie_exists("Alien", user_id)
+
+
+def test_failing_statement_rolls_back_whole_batch(movie_storage, user_id):
+    from sqlalchemy.exc import IntegrityError
+
+    with pytest.raises(IntegrityError):
+        with movie_storage.batch() as tx:
+            tx.add_movie("Alien", 1979, 8.5, "", user_id)
+            tx.update_note("Star Wars", "note", user_id)
+            tx.add_movie("Aliens", 1986, 8.4, "", user_id)
+            tx.add_movie("Star Wars", 1977, 8.6, "", user_id)
+    assert not movie_storage.movie_exists("Alien", user_id)
+    assert not movie_storage.movie_exists("Aliens", user_id)
+    assert movie_storage.query_movies(user_id, title_contains="Star Wars")[0].note is None
+
+
+def test_identical_statements_are_merged(movie_storage, user_id):
+    with movie_storage.batch() as tx:
+        tx.add_movie("Alien", 1979, 8.5, "", user_id)
+        tx.add_movie("Aliens", 1986, 8.4, "", user_id)
+        tx.update_note("Alien", "first", user_id)
+        tx.update_note("Aliens", "second", user_id)
+        tx.update_note("Not There", "third", user_id)
+        tx.delete_movie("Alien", user_id)
+    assert tx.results == [
+        movie_storage.StatementResult("add_movie", 2, 2),
+        movie_storage.StatementResult("update_note", 3, 2),
+        movie_storage.StatementResult("delete_movie", 1, 1),
+    ]
+
+
+def test_update_movie_with_stale_version_changes_nothing(movie_storage, user_id):
+    version = movie_storage.list_movies(user_id)["Star Wars"]["version"]
+    assert movie_storage.update_movie("Star Wars", 1977, 9.0, "", user_id, expected_version=version)
+
+    with movie_storage.batch() as tx:
+        tx.update_movie("Star Wars", 1977, 1.0, "", user_id, expected_version=version)
+    assert tx.results == [movie_storage.StatementResult("update_movie", 1, 0)]
+    assert movie_storage.list_movies(user_id)["Star Wars"]["rating"] == 9.0
+    assert not movie_storage.update_movie("Star Wars", 1977, 1.0, "", user_id, expected_version=version)
@@ -0,0 +1,16 @@
+from api import omdb_api
+
+
+def test_search_titles_tells_no_results_from_failures(monkeypatch):
+    responses = {
+        "hit": {"Response": "True", "Search": [{"imdbID": "tt0133093"}, {"Title": "no id"}]},
+        "none": {"Response": "False", "Error": omdb_api.SEARCH_NOT_FOUND},
+        "limit": {"Response": "False", "Error": "Request limit reached!"},
+        "down": None,
+    }
+    monkeypatch.setattr(omdb_api, "_get", lambda params: responses[params["s"]])
+
+    assert omdb_api.search_titles("hit") == ["tt0133093"]
+    assert omdb_api.search_titles("none") == []
+    assert omdb_api.search_titles("limit") is None
+    assert omdb_api.search_titles("down") is None
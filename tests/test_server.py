@@ -0,0 +1,119 @@
+import http.client
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def base(movie_storage, monkeypatch):
+    """A running server on a free port over a temporary database with one user and 5 movies."""
+    with movie_storage.batch() as tx:
+        tx.add_user("tester")
+        for n in range(5):
+            tx.add_movie(f"Movie {n}", 2000 + n, 5.0 + n, "", 1)
+    monkeypatch.setattr(server, "cache", server.ResponseCache())
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.MovieRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(port: int, path: str, **headers) -> tuple[int, dict, bytes]:
+    """Send a GET request and return (status, headers, body)."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_response_cache_drops_entries_of_older_versions():
+    cache = server.ResponseCache(max_entries=2)
+    entry = server.CachedResponse((1, 100), b"body", "text/plain", 0)
+    cache.put("a", entry)
+    assert cache.get("a", (1, 100)) is entry
+    assert cache.get("a", (2, 100)) is None
+    assert cache.get("a", (1, 100)) is None
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = server.ResponseCache(max_entries=2)
+    for key in "abc":
+        cache.put(key, server.CachedResponse((1, 0), key.encode(), "text/plain", 0))
+    assert cache.get("a", (1, 0)) is None
+    assert cache.get("c", (1, 0)).body == b"c"
+
+
+def test_etag_revalidation_until_data_changes(base, movie_storage):
+    status, headers, body = get(base, "/api/users/1/movies")
+    assert status == 200
+    assert json.loads(body)["total"] == 5
+
+    status, _, body = get(base, "/api/users/1/movies", **{"If-None-Match": headers["ETag"]})
+    assert (status, body) == (304, b"")
+
+    movie_storage.add_movie("New Movie", 2020, 7.0, "", 1)
+    status, new_headers, body = get(base, "/api/users/1/movies", **{"If-None-Match": headers["ETag"]})
+    assert status == 200
+    assert new_headers["ETag"] != headers["ETag"]
+    assert json.loads(body)["total"] == 6
+
+
+def test_last_modified_only_sent_once_its_second_is_over(base, monkeypatch):
+    now = time.time_ns()
+    monkeypatch.setattr(server.storage, "get_data_version", lambda: (0, now))
+    _, headers, _ = get(base, "/api/users")
+    assert "Last-Modified" not in headers
+    status, _, _ = get(base, "/api/users", **{"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert status == 200
+
+    earlier = now - 10 * 10 ** 9
+    monkeypatch.setattr(server.storage, "get_data_version", lambda: (0, earlier))
+    _, headers, _ = get(base, "/api/users")
+    status, _, _ = get(base, "/api/users", **{"If-Modified-Since": headers["Last-Modified"]})
+    assert status == 304
+
+
+def test_page_links_keep_the_query(base):
+    status, _, body = get(base, "/users/1?per_page=1&sort=year&order=desc&page=2")
+    assert status == 200
+    html = body.decode("utf-8")
+    assert 'href="?per_page=1&amp;sort=year&amp;order=desc&amp;page=1"' in html
+    assert 'href="?per_page=1&amp;sort=year&amp;order=desc&amp;page=3"' in html
+
+
+@pytest.mark.parametrize("query", [
+    "page=0", "page=99999999999999999999", "per_page=101", "sort=poster_url",
+    "order=up", "min_rating=abc", "min_rating=nan", "min_rating=inf",
+])
+def test_invalid_parameters_are_rejected(base, query):
+    status, headers, body = get(base, f"/api/users/1/movies?{query}")
+    assert status == 400
+    assert headers["Content-Type"] == "application/json"
+    assert "error" in json.loads(body)
+
+
+def test_unknown_routes_and_users_are_not_found(base):
+    assert get(base, "/nowhere")[0] == 404
+    assert get(base, "/api/users/99/movies")[0] == 404
+
+
+def test_unexpected_errors_are_answered_with_500(base, monkeypatch):
+    def broken(user_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(server.storage, "get_movie_stats", broken)
+    status, headers, body = get(base, "/api/users/1/stats")
+    assert status == 500
+    assert headers["Content-Type"] == "application/json"
+    assert json.loads(body) == {"error": "Internal server error"}
@@ -0,0 +1,61 @@
+import functools
+
+import pytest
+
+from api import imdb_dataset, omdb_api, title_resolver
+
+ONLINE = {"title": "The Matrix Revolutions", "year": 2003, "rating": 6.7,
+          "poster_url": "https://example.com/poster.jpg", "imdb_id": "tt0242653"}
+
+
+@pytest.fixture
+def resolver(tmp_path, imdb_dumps, movie_storage, monkeypatch):
+    """title_resolver with an imported offline database and a fake OMDb that records its calls."""
+    db_path = str(tmp_path / "imdb.db")
+    imdb_dataset.import_dataset(*imdb_dumps, db_path=db_path)
+    monkeypatch.setattr(imdb_dataset, "is_available", lambda: True)
+    monkeypatch.setattr(imdb_dataset, "find_titles", functools.partial(imdb_dataset.find_titles, db_path=db_path))
+
+    calls = []
+    monkeypatch.setattr(omdb_api, "is_test_mode", lambda: False)
+    monkeypatch.setattr(omdb_api, "fetch_movie_data", lambda title: calls.append(("t", title)) or None)
+    monkeypatch.setattr(omdb_api, "search_titles", lambda title: calls.append(("s", title)) or [ONLINE["imdb_id"]])
+    monkeypatch.setattr(omdb_api, "fetch_movie_by_id", lambda imdb_id: calls.append(("i", imdb_id)) or ONLINE)
+    return calls
+
+
+def test_exact_offline_match_needs_no_network(resolver):
+    candidates = title_resolver.resolve_title("the matrix")
+    assert candidates[0]["imdb_id"] == "tt0133093"
+    assert resolver == []
+
+
+def test_fuzzy_offline_matches_are_merged_with_online_results(resolver):
+    candidates = title_resolver.resolve_title("Shawshank Redemtion")
+    assert {c["imdb_id"] for c in candidates} == {"tt0111161", ONLINE["imdb_id"]}
+    assert ("s", "Shawshank Redemtion") in resolver
+
+
+def test_online_results_are_cached(resolver):
+    title_resolver.resolve_title("Shawshank Redemtion")
+    resolver.clear()
+    assert len(title_resolver.resolve_title("shawshank redemtion")) == 2
+    assert resolver == []
+
+
+def test_failed_round_trip_is_not_cached(resolver, monkeypatch):
+    monkeypatch.setattr(omdb_api, "search_titles", lambda title: resolver.append(("s", title)) and None)
+    assert [c["imdb_id"] for c in title_resolver.resolve_title("Shawshank Redemtion")] == ["tt0111161"]
+
+    monkeypatch.setattr(omdb_api, "search_titles", lambda title: resolver.append(("s", title)) or [ONLINE["imdb_id"]])
+    resolver.clear()
+    assert len(title_resolver.resolve_title("Shawshank Redemtion")) == 2
+    assert ("s", "Shawshank Redemtion") in resolver
+
+
+def test_failed_detail_fetch_is_not_cached(resolver, monkeypatch):
+    monkeypatch.setattr(omdb_api, "fetch_movie_by_id", lambda imdb_id: None)
+    assert len(title_resolver.resolve_title("Shawshank Redemtion")) == 1
+    resolver.clear()
+    title_resolver.resolve_title("Shawshank Redemtion")
+    assert ("s", "Shawshank Redemtion") in resolver